@@ -1,5 +1,14 @@
+import time
+
+# Following variable is used to measure the time spent importing application's modules...
+_import_start_time = time.perf_counter()
+
 from src import Common
 from src.TimeSeriesDataset.TimeSeriesDatasetGlobalClimateChange import *
+from src.TimeSeriesDataset.TimeSeriesDatasetManifest import TimeSeriesDatasetManifest
+from src.TimeSeriesDataset.TimeSeriesDatasetRegistry import TimeSeriesDatasetDescriptor, TimeSeriesDatasetRegistry
+
+_import_duration = time.perf_counter() - _import_start_time
 
 
 class ApplicationOptions(object):
@@ -20,36 +29,139 @@ class ApplicationOptions(object):
         self.display_univariate_regression_line = False
 
 
+class ApplicationStartupReport(object):
+    """
+    This class is used to store the time (in seconds) spent by each phase of application's startup, that is modules
+    import, dataset discovery, dataset loading and first render of the widgets.
+
+    If a 'budget' (in seconds) is specified, it is used to check if the whole startup ('cold start') is fast enough.
+    """
+
+    phases = ["import", "dataset_discovery", "dataset_loading", "first_widget_render"]
+
+    def __init__(self, budget=None):
+
+        if budget is not None and (not isinstance(budget, (int, float)) or budget <= 0):
+            raise ValueError("[ERROR]: 'budget' must be a positive number or 'None'!")
+
+        self.__budget = budget
+        self.__durations = dict()
+
+    def record(self, phase, seconds):
+        """
+        This function is used to store the duration of specified phase. Durations of the same phase are summed.
+        """
+        if phase not in ApplicationStartupReport.phases:
+            raise ValueError("[ERROR]: Startup phase '{}' does NOT exist!".format(phase))
+
+        self.__durations[phase] = self.__durations.get(phase, 0.0) + seconds
+
+    def get_durations(self):
+        """
+        This function is used to get recorded durations, ordered by phase.
+        """
+        return dict((x, self.__durations[x]) for x in ApplicationStartupReport.phases if x in self.__durations)
+
+    def get_total(self):
+        return sum(self.__durations.values())
+
+    def get_budget(self):
+        return self.__budget
+
+    def is_within_budget(self):
+        return self.__budget is None or self.get_total() <= self.__budget
+
+    def __str__(self):
+        output = "Startup Report:\n"
+
+        for phase, seconds in self.get_durations().items():
+            output += "-> {:<20} {:8.3f} s\n".format(phase, seconds)
+
+        output += "-> {:<20} {:8.3f} s".format("total", self.get_total())
+        if self.__budget is not None:
+            output += " (budget {:.3f} s, {})".format(self.__budget,
+                                                       "OK" if self.is_within_budget() else "EXCEEDED")
+
+        return output
+
+
 class Application(object):
     """
     This class represent the controller of this application.
     It is used to load and hold datasets data and all options necessary to plot data.
+
+    Datasets are loaded 'lazily', that is only when they are selected for the first time, unless 'preload_datasets' is
+    set: in that case they are all parsed at startup by a pool of 'processes' worker processes. If a 'memory_budget'
+    (in bytes) is specified, least-recently-used datasets are evicted from memory when it is exceeded.
+
+    If 'use_memory_map' is set, datasets are backed by read-only memory-mapped cache files, shared by all kernels
+    running on the same host. If 'partitioning' is 'state' or 'state_and_decade', datasets are split into partitions
+    stored on disk and every query reads only the partitions it needs.
+
+    A summary of every loaded dataset is stored inside the manifest of './data' directory: in this way, dataset type
+    and options are known without reading any dataset file.
+
+    Time spent by each startup phase is collected inside an 'ApplicationStartupReport' object; if a 'startup_budget'
+    (in seconds) is specified, a warning is printed when startup exceeds it.
     """
 
-    def __init__(self, dataset_file_path=None):
+    # Following variable is used to get a dataset class from its name, as stored inside the manifest...
+    dataset_classes = dict((x.__name__, x) for x in [TimeSeriesDatasetGlobalClimateChange,
+                                                     TimeSeriesDatasetGlobalClimateChangeNoCity,
+                                                     TimeSeriesDatasetGlobalClimateChangeNoStateNoCity])
+
+    def __init__(self, dataset_file_path=None, use_cache=True, memory_budget=None, preload_datasets=False,
+                 processes=None, use_memory_map=False, partitioning=None, startup_budget=None):
 
         if dataset_file_path is not None and not isinstance(dataset_file_path, str):
             raise TypeError("[ERROR]: 'dataset_filename' must 'str' type object! ({})".format(type(dataset_file_path)))
+        if not isinstance(use_cache, bool):
+            raise TypeError("[ERROR]: 'use_cache' must 'bool' type object! ({})".format(type(use_cache)))
+        if memory_budget is not None and not isinstance(memory_budget, int):
+            raise TypeError("[ERROR]: 'memory_budget' must 'int' type object! ({})".format(type(memory_budget)))
+        if not isinstance(preload_datasets, bool):
+            raise TypeError(
+                "[ERROR]: 'preload_datasets' must 'bool' type object! ({})".format(type(preload_datasets)))
+
+        if not isinstance(use_memory_map, bool):
+            raise TypeError("[ERROR]: 'use_memory_map' must 'bool' type object! ({})".format(type(use_memory_map)))
+        if use_memory_map and not use_cache:
+            raise ValueError("[ERROR]: 'use_memory_map' requires 'use_cache'!")
+
+        self.__use_cache = use_cache
+        self.__use_memory_map = use_memory_map
+        self.__partitioning = partitioning
 
         self.__current_selected_dataset = None
         self.__current_selected_application_options = None
-        self.__dataset_registry = None
-        self.__application_options_registry = None
+        self.__dataset_registry = TimeSeriesDatasetRegistry(memory_budget)
+        self.__dataset_manifest = TimeSeriesDatasetManifest("./data")
+        self.__application_options_registry = dict()
+
+        self.__startup_report = ApplicationStartupReport(startup_budget)
+        self.__startup_report.record("import", _import_duration)
 
         print("Please Wait\n-> Collecting dataset...")
+
+        start_time = time.perf_counter()
         self.__build_dataset_registry(dataset_file_path)
-        self.__build_options_registry()
+        self.__startup_report.record("dataset_discovery", time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        if preload_datasets:
+            self.__dataset_registry.load_all(processes, self.__on_dataset_preloaded)
+
         print("-> Collecting dataset COMPLETE!")
 
         # Select first dataset as default...
         self.set_current_selected_dataset(self.get_available_dataset_names()[0])
+        self.__startup_report.record("dataset_loading", time.perf_counter() - start_time)
 
     def __build_dataset_registry(self, dataset_file_path):
         """
-        This function is used to build a 'Dataset' object for each available datasets.
+        This function is used to register a 'TimeSeriesDatasetDescriptor' object for each available datasets.
+        No dataset is loaded here.
         """
-        self.__dataset_registry = dict()
-
         datasets = Common.list_files("./data", ".csv")
         if len(datasets) == 0:
             raise RuntimeError("[ERROR] './data directory is empty. Did you download datasets?'")
@@ -58,41 +170,114 @@ class Application(object):
         if dataset_file_path is not None and dataset_file_path in datasets:
             datasets = [dataset_file_path]
 
-        # Build dataset...
+        # Build dataset descriptors...
         for file in datasets:
 
             dataset_name = file.rsplit('/', 1)[1]
-            dataset_header = pandas.read_csv(file, nrows=0).columns
+            dataset_summary = self.__dataset_manifest.get(file)
 
-            if "City" in dataset_header and "Country" in dataset_header:
-                dataset = TimeSeriesDatasetGlobalClimateChange(dataset_name, file)
-            elif "City" not in dataset_header and "Country" in dataset_header:
-                dataset = TimeSeriesDatasetGlobalClimateChangeNoCity(dataset_name, file)
+            if dataset_summary is not None:
+                dataset_class = Application.dataset_classes[dataset_summary["dataset_class"]]
             else:
-                dataset = TimeSeriesDatasetGlobalClimateChangeNoStateNoCity(dataset_name, file)
+                dataset_header = pandas.read_csv(file, nrows=0).columns
+
+                if "City" in dataset_header and "Country" in dataset_header:
+                    dataset_class = TimeSeriesDatasetGlobalClimateChange
+                elif "City" not in dataset_header and "Country" in dataset_header:
+                    dataset_class = TimeSeriesDatasetGlobalClimateChangeNoCity
+                else:
+                    dataset_class = TimeSeriesDatasetGlobalClimateChangeNoStateNoCity
 
-            self.__dataset_registry[dataset_name] = dataset
+            self.__dataset_registry.register(TimeSeriesDatasetDescriptor(dataset_name,
+                                                                         file,
+                                                                         dataset_class,
+                                                                         self.__use_cache,
+                                                                         self.__use_memory_map,
+                                                                         self.__partitioning))
 
-    def __build_options_registry(self):
+    def __on_dataset_preloaded(self, dataset_name, completed, total):
+        self.__update_dataset_manifest(dataset_name)
+        print("-> [{}/{}] '{}' loaded!".format(completed, total, dataset_name))
+
+    def __update_dataset_manifest(self, dataset_name):
         """
-        This function is used to build an 'ApplicationOptions' object for each available dataset.
+        This function is used to store the summary of specified dataset inside the manifest, if missing or stale.
         """
-        self.__application_options_registry = dict()
+        file = self.__dataset_registry.get_descriptor(dataset_name).get_file()
+
+        if self.__dataset_manifest.get(file) is None:
+            self.__dataset_manifest.update(file, self.__dataset_registry.get(dataset_name).get_summary())
+
+    @staticmethod
+    def __build_options(dataset_summary):
+        """
+        This function is used to build an 'ApplicationOptions' object from the summary of a dataset.
+        """
+        output = ApplicationOptions()
 
-        for dataset_name, dataset in self.__dataset_registry.items():
-            x = ApplicationOptions()
+        time_range_as_years = [pandas.Timestamp(x).year for x in dataset_summary["time_range"]]
 
-            x.plot_time_range_as_years = dataset.get_time_range_as_years()
-            x.available_time_range_as_years = dataset.get_time_range_as_years()
-            x.available_columns = dataset.get_numeric_type_columns()
-            x.active_columns = [x.available_columns[0]]
+        output.plot_time_range_as_years = list(time_range_as_years)
+        output.available_time_range_as_years = list(time_range_as_years)
+        output.available_columns = list(dataset_summary["numeric_type_columns"])
+        output.active_columns = [output.available_columns[0]]
 
-            self.__application_options_registry[dataset_name] = x
+        return output
 
     def set_current_selected_dataset(self, dataset_name):
 
-        self.__current_selected_dataset = self.__dataset_registry[dataset_name]
-        self.__current_selected_application_options = self.__application_options_registry[dataset_name]
+        self.__current_selected_dataset = self.__dataset_registry.get(dataset_name)
+        self.__update_dataset_manifest(dataset_name)
+
+        self.__current_selected_application_options = self.get_application_options(dataset_name)
+
+    def refresh_current_selected_dataset(self):
+        """
+        This function is used to pick up changes of the file of current selected dataset, without reloading it if
+        rows have only been appended (see 'TimeSeriesDataset.refresh'). Its available time range and the manifest
+        are updated accordingly. It returns the number of parsed rows.
+        """
+        output = self.__current_selected_dataset.refresh()
+
+        self.__update_dataset_manifest(self.__current_selected_dataset.get_name())
+        self.__current_selected_application_options.available_time_range_as_years = \
+            self.__current_selected_dataset.get_time_range_as_years()
+
+        return output
+
+    def get_application_options(self, dataset_name):
+        """
+        This function is used to get options of specified dataset. When the dataset is described by the manifest,
+        it is not loaded.
+        """
+        # Options are built once and kept even if dataset is evicted, so user's choices survive...
+        output = self.__application_options_registry.get(dataset_name)
+
+        if output is None:
+            output = Application.__build_options(self.get_dataset_summary(dataset_name))
+            self.__application_options_registry[dataset_name] = output
+
+        return output
+
+    def get_dataset_summary(self, dataset_name):
+        """
+        This function is used to get the summary of specified dataset (see 'TimeSeriesDataset.get_summary'),
+        reading it from the manifest or, if missing, loading the dataset.
+        """
+        descriptor = self.__dataset_registry.get_descriptor(dataset_name)
+        if descriptor is None:
+            raise ValueError("[ERROR]: Dataset '{}' does NOT exist!".format(dataset_name))
+
+        output = self.__dataset_manifest.get(descriptor.get_file())
+        if output is None:
+            self.__update_dataset_manifest(dataset_name)
+            output = self.__dataset_manifest.get(descriptor.get_file())
+
+        # Manifest could be not writable...
+        if output is None:
+            output = self.__dataset_registry.get(dataset_name).get_summary()
+
+        return output
 
     def get_current_selected_dataset(self):
         return self.__current_selected_dataset
@@ -101,4 +286,24 @@ class Application(object):
         return self.__current_selected_application_options
 
     def get_available_dataset_names(self):
-        return list(self.__dataset_registry.keys())
+        return self.__dataset_registry.get_dataset_names()
+
+    def get_dataset_registry(self):
+        return self.__dataset_registry
+
+    def record_startup_phase(self, phase, seconds):
+        """
+        This function is used to add the duration of a startup phase measured outside this class (i.e. first render
+        of the widgets). A warning is printed if startup exceeds its budget.
+        """
+        self.__startup_report.record(phase, seconds)
+
+        if not self.__startup_report.is_within_budget():
+            print("[WARNING]: Startup took {:.3f} s, exceeding its budget of {:.3f} s!".format(
+                self.__startup_report.get_total(), self.__startup_report.get_budget()))
+
+    def get_startup_report(self):
+        return self.__startup_report
+
+    def print_startup_report(self):
+        print(self.__startup_report)
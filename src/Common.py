@@ -1,6 +1,31 @@
+import importlib.util
 import os
+import sys
 
-import matplotlib
+
+def lazy_import(module_name):
+    """
+    This function is used to import a module 'lazily', that is the module is actually loaded only when one of its
+    attributes is accessed for the first time. It is used to defer heavy imports (i.e. 'pandas') to first use.
+
+    :param module_name:
+    :return:
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ModuleNotFoundError("[ERROR]: No module named '{}'.".format(module_name))
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+
+    output = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = output
+    loader.exec_module(output)
+
+    return output
 
 
 def list_files(path, extension):
@@ -29,10 +54,19 @@ def list_files(path, extension):
     return output
 
 
-def plot(data, plot_title):
+def plot(data, plot_title, overlay=None):
     """
     This function is used to plot
+
+    :param data:
+    :param plot_title:
+    :param overlay: 'dict' object mapping the names of derived series (i.e. 'Regression Line') to their values, one for
+    each record of data; they are plotted together with data, without adding them to it.
+    :return:
     """
+    import matplotlib
+
+    pandas = lazy_import("pandas")
 
     # Following statement is used to avoid following error:
     # OverflowError: Exceeded cell block limit (set 'agg.path.chunksize' rcparam)
@@ -41,7 +75,10 @@ def plot(data, plot_title):
 
     # Plot...
     # ========================================= #
-    data.plot(title=plot_title,
-              figsize=(16, 9),
-              grid=True,
-              legend=True)
+    axes = data.plot(title=plot_title,
+                     figsize=(16, 9),
+                     grid=True,
+                     legend=True)
+
+    for name, values in (overlay or dict()).items():
+        pandas.Series(values, index=data.index, name=name, copy=False).plot(ax=axes, grid=True, legend=True)
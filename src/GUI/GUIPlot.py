@@ -1,6 +1,8 @@
 import calendar
-import ipywidgets
-from IPython.core.display import clear_output, display
+
+from src import Common
+
+ipywidgets = Common.lazy_import("ipywidgets")
 
 
 class GUIPlot(object):
@@ -36,6 +38,8 @@ class GUIPlot(object):
         """
         This function is used to display all widgets of the UI.
         """
+        from IPython.core.display import clear_output, display
+
         clear_output()
         display(ipywidgets.VBox(self._widget_list))
 
@@ -81,14 +85,14 @@ class GUIPlot(object):
             placeholder="Select/Type 'State'...",
             description='State:',
             layout=ipywidgets.Layout(width='350px'),
-            continuous_update=False
+            continuous_update=True
         )
 
         self._widget_city_combobox = ipywidgets.Combobox(
             placeholder="Select/Type 'City'...",
             description='City:',
             layout=ipywidgets.Layout(width='350px'),
-            continuous_update=False,
+            continuous_update=True,
         )
 
         self._widget_month_checkbox = ipywidgets.Checkbox(
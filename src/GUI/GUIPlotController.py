@@ -1,9 +1,11 @@
 import threading
+import time
 
 from src import Common
 from src.Application import Application
 from src.GUI.GUICommon import GUICommon
 from src.GUI.GUIPlot import GUIPlot
+from src.GUI.GUISearchIndex import GUISearchIndex
 from src.GUI.RestAPI.StateFlagUrlRegistry import StateFlagUrlRegistry
 from src.TimeSeriesDataset.TimeSeriesDatasetGlobalClimateChange import TimeSeriesDatasetGlobalClimateChange
 
@@ -13,7 +15,13 @@ class GUIPlotController(GUIPlot):
     This class is used as controller for all 'ipywidgets widget' inside 'GUIPlot' class.
     """
 
+    # Following variable is the maximum number of place names sent to 'State' and 'City' comboboxes...
+    search_result_count = 50
+
     def __init__(self, application):
+        # Following variable is used to measure first render time (see 'ApplicationStartupReport')...
+        self.__render_start_time = time.perf_counter()
+
         super().__init__()
 
         if application is None:
@@ -25,6 +33,7 @@ class GUIPlotController(GUIPlot):
         self.__application = application
         self.__application_options = None
         self.__state_flag_url_registry = StateFlagUrlRegistry()
+        self.__search_indexes = dict()
         self.__lock = threading.Lock()
 
     def display(self):
@@ -33,6 +42,11 @@ class GUIPlotController(GUIPlot):
 
         super(GUIPlotController, self).display()
 
+        if self.__render_start_time is not None:
+            self.__application.record_startup_phase("first_widget_render",
+                                                    time.perf_counter() - self.__render_start_time)
+            self.__render_start_time = None
+
     def plot_event(self, button):
         """
         This function is used to perform the plot of data according to user specified options.
@@ -42,6 +56,10 @@ class GUIPlotController(GUIPlot):
         self.display()
 
         try:
+            # Pick up rows appended to dataset file, if any...
+            # ========================================= #
+            self.__application.refresh_current_selected_dataset()
+
             dataset = self.__application.get_current_selected_dataset()
             options = self.__application.get_current_application_options()
 
@@ -61,12 +79,15 @@ class GUIPlotController(GUIPlot):
 
             # If required, calc regression line...
             # ========================================= #
+            # Filtered data are read-only: derived series are kept apart and plotted as an overlay...
+            overlay = dict()
+
             if options.display_univariate_regression_line:
 
                 univariate_regression_line = TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_line(
                     data)
 
-                data['Regression Line'] = univariate_regression_line.get_fitted_values_y()
+                overlay['Regression Line'] = univariate_regression_line.get_fitted_values_y()
 
                 self._widget_univariate_regression_line_info_HTMLMath.description = "Univariate Regression Line Info"
                 self._widget_univariate_regression_line_info_HTMLMath.value = \
@@ -96,9 +117,9 @@ class GUIPlotController(GUIPlot):
 
             # Make plot title...
             # ========================================= #
-            Common.plot(data, plot_title)
+            Common.plot(data, plot_title, overlay)
 
-        except ValueError as error:
+        except (ValueError, OSError) as error:
             self._widget_error_label.value = "$\\textbf{" + "{}".format(error) + "}$"
             self._widget_univariate_regression_line_info_HTMLMath.value = ""
             self._widget_univariate_regression_line_info_HTMLMath.description = ""
@@ -132,19 +153,63 @@ class GUIPlotController(GUIPlot):
 
         # Section: "City and State Selection"
         # ============================================================================================================ #
+        self.__update_place_selection()
+
+        # Section: "Time Range Selection"
+        # ============================================================================================================ #
+        self._widget_time_int_range_slider.max = self.__application_options.available_time_range_as_years[1]
+        self._widget_time_int_range_slider.min = self.__application_options.available_time_range_as_years[0]
+        self._widget_time_int_range_slider.value = self.__application_options.plot_time_range_as_years
+
+        # Section: "Active Column Selection"
+        # ============================================================================================================ #
+        self._widget_active_columns_select_multiple.options = self.__application_options.available_columns
+        self._widget_active_columns_select_multiple.value = self.__application_options.active_columns
+
+        # Section: "Univariate Regression Line"
+        # ============================================================================================================ #
+        self._widget_display_univariate_regression_line_checkbox.value = self.__application_options.display_univariate_regression_line
+
+        self.__register_callback()
+        self.__lock.release()
+
+    def __update_place_selection(self):
+        """
+        This function is used to update 'State' and 'City' comboboxes, their labels and the flag of selected 'State'.
+        """
+        current_selected_dataset = self.__application.get_current_selected_dataset()
+
+        # Disable following to prevent some errors and hang...
+        self._widget_city_combobox.disabled = True
+        self._widget_state_combobox.disabled = True
+
         self._widget_state_combobox.value = self.__application_options.state
         self._widget_city_combobox.value = self.__application_options.city
 
+        self._widget_state_combobox.disabled = current_selected_dataset.get_state_list() is None
+        self._widget_city_combobox.disabled = current_selected_dataset.get_city_list() is None
+
+        self.__update_place_options()
+
+    def __update_place_options(self):
+        """
+        This function is used to update the options of 'State' and 'City' comboboxes, their labels and the flag of
+        selected 'State'. Comboboxes receive only the names best matching typed text (see 'GUISearchIndex').
+
+        It is also called while user is typing a place name: so, neither 'disabled' nor 'value' attribute of
+        comboboxes are written here, otherwise focused input would be blurred or typed characters overwritten.
+        """
+        current_selected_dataset = self.__application.get_current_selected_dataset()
+
         # STATE...
         # ========================================= #
         state_list = current_selected_dataset.get_state_list()
 
         if state_list is None:
-            self._widget_state_combobox.disabled = True
             self._widget_states_summary_label.value = "No $\\textbf{State}$ inside selected dataset!"
         else:
-            self._widget_state_combobox.disabled = False
-            self._widget_state_combobox.options = state_list
+            self._widget_state_combobox.options = self.__search_place_names(
+                ("state",), state_list, self.__application_options.state)
             self._widget_states_summary_label.value = "This dataset contains ${}$ states!".format(len(state_list))
 
         # CITIES...
@@ -154,15 +219,17 @@ class GUIPlotController(GUIPlot):
             self.__application_options.state)
 
         if city_list is None:
-            self._widget_city_combobox.disabled = True
             self._widget_cities_summary_label.value = "No $\\textbf{City}$ inside selected dataset!"
         else:
-            self._widget_city_combobox.disabled = False
-            self._widget_city_combobox.options = city_list
             self._widget_cities_summary_label.value = "This dataset contains ${}$ cities!".format(len(city_list))
 
-            if city_list_inside_state is not None:
-                self._widget_city_combobox.options = city_list_inside_state
+            if city_list_inside_state is None:
+                self._widget_city_combobox.options = self.__search_place_names(
+                    ("city",), city_list, self.__application_options.city)
+            else:
+                self._widget_city_combobox.options = self.__search_place_names(
+                    ("city", self.__application_options.state), city_list_inside_state,
+                    self.__application_options.city)
 
         # HOW MANY CITIES INSIDE SELECT STATE...
         # ========================================= #
@@ -186,20 +253,33 @@ class GUIPlotController(GUIPlot):
                 self._widget_state_flag_image_HTML.value = '<image src="{}" style="border:2px solid black; width:90px">'.format(
                     url)
 
-        # Section: "Time Range Selection"
-        # ============================================================================================================ #
-        self._widget_time_int_range_slider.max = self.__application_options.available_time_range_as_years[1]
-        self._widget_time_int_range_slider.min = self.__application_options.available_time_range_as_years[0]
-        self._widget_time_int_range_slider.value = self.__application_options.plot_time_range_as_years
+    def __search_place_names(self, key, names, text):
+        """
+        This function is used to get the names best matching specified text, among specified names. Search indexes
+        are built when first needed and rebuilt when names change (i.e. another dataset is selected).
+        """
+        key = (self.__application.get_current_selected_dataset().get_name(),) + key
 
-        # Section: "Active Column Selection"
-        # ============================================================================================================ #
-        self._widget_active_columns_select_multiple.options = self.__application_options.available_columns
-        self._widget_active_columns_select_multiple.value = self.__application_options.active_columns
+        entry = self.__search_indexes.get(key)
+        if entry is None or entry[0] is not names:
+            entry = (names, GUISearchIndex(names))
+            self.__search_indexes[key] = entry
 
-        # Section: "Univariate Regression Line"
-        # ============================================================================================================ #
-        self._widget_display_univariate_regression_line_checkbox.value = self.__application_options.display_univariate_regression_line
+        return entry[1].search(text, GUIPlotController.search_result_count)
+
+    def __update_place_selection_only(self, is_state_changed=False):
+        """
+        This function is used to update 'State' and 'City' options only, while user is typing a place name. If
+        'is_state_changed' is 'True' (i.e. a 'City' of another 'State' has been selected), selected 'State' is also
+        written into its combobox: it is safe, since user is typing into 'City' combobox.
+        """
+        self.__lock.acquire()
+        self.__unregister_callback()
+
+        if is_state_changed:
+            self._widget_state_combobox.value = self.__application_options.state
+
+        self.__update_place_options()
 
         self.__register_callback()
         self.__lock.release()
@@ -223,7 +303,7 @@ class GUIPlotController(GUIPlot):
     def _on_change_widget_state_combobox(self, change):
         if GUICommon.is_widget_value_changed(change):
             self.__application_options.state = change['new']
-            self.update()
+            self.__update_place_selection_only()
 
     def _on_change_widget_city_combobox(self, change):
 
@@ -231,10 +311,12 @@ class GUIPlotController(GUIPlot):
             self.__application_options.city = change['new']
 
             state = self.__application.get_current_selected_dataset().get_state_of_city(change['new'])
-            if state is not None:
+            is_state_changed = state is not None and state != self.__application_options.state
+
+            if is_state_changed:
                 self.__application_options.state = state
 
-            self.update()
+            self.__update_place_selection_only(is_state_changed)
 
     def _on_change_widget_time_int_range_slider(self, change):
         if GUICommon.is_widget_value_changed(change):
@@ -1,6 +1,8 @@
 import calendar
-import ipywidgets
-from IPython.core.display import clear_output, display
+
+from src import Common
+
+ipywidgets = Common.lazy_import("ipywidgets")
 
 
 class GUIRegressionLineComparison(object):
@@ -32,6 +34,8 @@ class GUIRegressionLineComparison(object):
         """
         This function is used to display all widgets of the UI.
         """
+        from IPython.core.display import clear_output, display
+
         clear_output()
         display(ipywidgets.VBox(self._widget_list))
 
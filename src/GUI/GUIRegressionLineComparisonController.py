@@ -1,4 +1,5 @@
 import threading
+import time
 
 from src.Application import Application
 from src.GUI.GUICommon import GUICommon
@@ -13,6 +14,9 @@ class GUIRegressionLineComparisonController(GUIRegressionLineComparison):
     """
 
     def __init__(self, application):
+        # Following variable is used to measure first render time (see 'ApplicationStartupReport')...
+        self.__render_start_time = time.perf_counter()
+
         super().__init__()
 
         if application is None:
@@ -40,6 +44,11 @@ class GUIRegressionLineComparisonController(GUIRegressionLineComparison):
 
         super(GUIRegressionLineComparisonController, self).display()
 
+        if self.__render_start_time is not None:
+            self.__application.record_startup_phase("first_widget_render",
+                                                    time.perf_counter() - self.__render_start_time)
+            self.__render_start_time = None
+
     def add_state(self, button):
         """
         This function add a state to the list for 'Regression Line Comparison'
@@ -86,24 +95,23 @@ class GUIRegressionLineComparisonController(GUIRegressionLineComparison):
             if len(self.__application_options.states) == 1:
                 raise ValueError("[ERROR]: Please, specify at least 2 states!!")
 
-            state_regression_line_list = list()
+            # Get filtered data of all states at once...
+            # ========================================= #
+            data_by_state = self.__current_selected_dataset.get_grouped_filtered_data(
+                self.__application_options.month_name,
+                self.__application_options.month_filter_enabled,
+                list(self.__application_options.states),
+                self.__application_options.plot_time_range_as_years,
+                self.__application_options.active_columns)
 
             # Build regression lines belonging to each state...
             # ========================================= #
             for state in self.__application_options.states:
-
-                data = self.__current_selected_dataset.get_filtered_data(self.__application_options.month_name,
-                                                                         self.__application_options.month_filter_enabled,
-                                                                         self.__application_options.city,
-                                                                         state,
-                                                                         self.__application_options.plot_time_range_as_years,
-                                                                         self.__application_options.active_columns)
-                if (len(data)) == 1:
+                if (len(data_by_state[state])) == 1:
                     raise ValueError("[ERROR]: Nothing to plot; only 1 record of data!!")
 
-                regression_line = TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_line(data,
-                                                                                                          name=state)
-                state_regression_line_list.append(regression_line)
+            state_regression_line_list = TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_lines(
+                {state: data_by_state[state] for state in self.__application_options.states})
 
             # Print a title...
             # ========================================= #
@@ -118,7 +126,8 @@ class GUIRegressionLineComparisonController(GUIRegressionLineComparison):
 
             # Rank...
             # ========================================= #
-            UnivariateRegressionLine.rank_regression_lines(state_regression_line_list)
+            rank = UnivariateRegressionLine.rank_regression_lines(state_regression_line_list)
+            UnivariateRegressionLine.print_rank(rank)
 
         except ValueError as error:
             self._widget_error_label.value = "$\\textbf{" + "{}".format(error) + "}$"
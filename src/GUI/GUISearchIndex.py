@@ -0,0 +1,62 @@
+import bisect
+
+
+class GUISearchIndex(object):
+    """
+    This class is used to search the names offered by a 'Combobox' widget (i.e. 'State' or 'City' names), so that the
+    widget receives only the best matches of the text typed by the user, instead of thousands of options.
+
+    Names are kept sorted ignoring case, so names starting with typed text are found by binary search. A 'trigram'
+    index, mapping every sequence of 3 characters to the names containing it, is used to find names containing typed
+    text. Names starting with typed text come first, followed by other matches; both are in alphabetical order.
+    """
+
+    def __init__(self, names):
+
+        if not isinstance(names, list):
+            raise TypeError("[ERROR]: 'names' must be 'list' type.")
+
+        self.__names = sorted(set(names), key=lambda x: (x.casefold(), x))
+        self.__keys = [x.casefold() for x in self.__names]
+        self.__trigrams = dict()
+
+        for k, key in enumerate(self.__keys):
+            for trigram in set(key[i:i + 3] for i in range(len(key) - 2)):
+                self.__trigrams.setdefault(trigram, list()).append(k)
+
+    def search(self, text, limit):
+        """
+        This function is used to get at most 'limit' names matching specified text, ignoring case. When text is
+        empty, the first names in alphabetical order are returned.
+        """
+        if not isinstance(text, str):
+            raise TypeError("[ERROR]: 'text' must be 'str' type.")
+        if not isinstance(limit, int) or limit < 0:
+            raise ValueError("[ERROR]: 'limit' must be a non-negative 'int'!")
+
+        key = text.casefold()
+        output = list()
+
+        # NAMES STARTING WITH TEXT...
+        # ========================================= #
+        k = bisect.bisect_left(self.__keys, key)
+        while k < len(self.__keys) and len(output) < limit and self.__keys[k].startswith(key):
+            output.append(k)
+            k += 1
+
+        # NAMES CONTAINING TEXT...
+        # ========================================= #
+        # Only names holding the rarest trigram of text are checked...
+        if len(output) < limit and len(key) >= 3:
+            candidates = min((self.__trigrams.get(key[i:i + 3], list()) for i in range(len(key) - 2)), key=len)
+
+            for k in candidates:
+                if len(output) == limit:
+                    break
+                if key in self.__keys[k] and not self.__keys[k].startswith(key):
+                    output.append(k)
+
+        return [self.__names[x] for x in output]
+
+    def get_size(self):
+        return len(self.__names)
@@ -1,4 +1,3 @@
-import requests
 import json
 
 
@@ -40,6 +39,8 @@ class StateFlagUrlRegistry(object):
         :param state_name:
         :return:
         """
+        import requests
+
         output = None
         url = "https://restcountries.eu/rest/v2/name/{}".format(state_name)
         try:
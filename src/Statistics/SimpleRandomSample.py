@@ -1,12 +1,24 @@
+from src import Common
+
+numpy = Common.lazy_import("numpy")
+
+
 class SimpleRandomSample(object):
     """
     This class represents a 'Simple Random Sample' X_1,X_2...,X_n
+
+    Observations are stored as a contiguous 'float64' array, so every statistic is computed by vectorized reductions.
     """
 
     def __init__(self, observations):
 
-        if not isinstance(observations, list):
-            raise ValueError("[ERROR]: 'observations' must be a 'list' type object!")
+        if not isinstance(observations, (list, numpy.ndarray)):
+            raise ValueError("[ERROR]: 'observations' must be a 'list' or a 'numpy.ndarray' type object!")
+
+        observations = numpy.ascontiguousarray(observations, dtype=numpy.float64)
+
+        if observations.ndim != 1:
+            raise ValueError("[ERROR]: 'observations' must be one-dimensional!")
 
         self.__observations = observations
         self.__size = len(observations)
@@ -19,12 +31,7 @@ class SimpleRandomSample(object):
         This function is used to get x^=_n(X), that is the sample mean of size n drawn from X
         """
         if self.__mean is None:
-
-            summation = 0
-            for value in self.__observations:
-                summation += value
-
-            self.__mean = summation / self.__size
+            self.__mean = float(self.__observations.sum() / self.__size)
 
         return self.__mean
 
@@ -33,12 +40,8 @@ class SimpleRandomSample(object):
         This function is used to calc S^2_n(X), that is the unbiased sample variance of size n drawn from X
         """
         if self.__unbiased_variance is None:
-
-            summation = 0
-            for value in self.__observations:
-                summation += (value - self.__mean) ** 2
-
-            self.__unbiased_variance = summation / (self.__size - 1)
+            deviations = self.__observations - self.get_mean()
+            self.__unbiased_variance = float(numpy.dot(deviations, deviations) / (self.__size - 1))
 
         return self.__unbiased_variance
 
@@ -61,16 +64,7 @@ class SimpleRandomSample(object):
                 "[ERROR]: 'sample_1' and 'sample_2' must be equal size! ( {} != {} )".format(sample_1.get_size(),
                                                                                              sample_2.get_size()))
 
-        observations_sample_1 = sample_1.get_observations()
-        observations_sample_2 = sample_2.get_observations()
-
-        sample_mean_1 = sample_1.get_mean()
-        sample_mean_2 = sample_2.get_mean()
-
-        size = sample_1.get_size()
-
-        output = 0
-        for k in range(0, size):
-            output = output + ((observations_sample_1[k] - sample_mean_1) * (observations_sample_2[k] - sample_mean_2))
+        deviations_sample_1 = sample_1.get_observations() - sample_1.get_mean()
+        deviations_sample_2 = sample_2.get_observations() - sample_2.get_mean()
 
-        return output / (size - 1)
+        return float(numpy.dot(deviations_sample_1, deviations_sample_2) / (sample_1.get_size() - 1))
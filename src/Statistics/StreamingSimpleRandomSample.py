@@ -0,0 +1,170 @@
+from src import Common
+
+numpy = Common.lazy_import("numpy")
+
+
+class StreamingSimpleRandomSample(object):
+    """
+    This class represents a 'Simple Random Sample' X_1,X_2...,X_n (optionally paired with Y_1,Y_2...,Y_n) whose
+    observations are not stored: sample size, means, sums of squared deviations and co-moment are updated
+    incrementally, following Welford's algorithm, as observations arrive (one by one or in chunks).
+
+    Partial states, computed over separate chunks or by separate worker processes, can be merged exactly (Chan et
+    al. formulas), so statistics of a series can be computed without holding it in a single list.
+    """
+
+    def __init__(self, paired=False):
+
+        if not isinstance(paired, bool):
+            raise ValueError("[ERROR]: 'paired' must be a 'bool' type object!")
+
+        self.__is_paired = paired
+        self.__size = 0
+
+        self.__mean = 0.0
+        self.__sum_of_squares = 0.0
+
+        self.__paired_mean = 0.0
+        self.__paired_sum_of_squares = 0.0
+        self.__co_moment = 0.0
+
+    def update(self, observations, paired_observations=None):
+        """
+        This function is used to add one or more observations (and, if sample is paired, as many paired
+        observations) to current sample.
+        """
+        if self.__is_paired != (paired_observations is not None):
+            raise ValueError("[ERROR]: 'paired_observations' must be specified if and only if sample is paired!")
+
+        observations = numpy.atleast_1d(numpy.asarray(observations, dtype=numpy.float64))
+        if observations.ndim != 1:
+            raise ValueError("[ERROR]: 'observations' must be one-dimensional!")
+
+        size = len(observations)
+        if size == 0:
+            return self
+
+        mean = float(observations.sum() / size)
+        deviations = observations - mean
+
+        paired_mean = 0.0
+        paired_sum_of_squares = 0.0
+        co_moment = 0.0
+
+        if self.__is_paired:
+            paired_observations = numpy.atleast_1d(numpy.asarray(paired_observations, dtype=numpy.float64))
+
+            if paired_observations.shape != observations.shape:
+                raise ValueError("[ERROR]: 'observations' and 'paired_observations' must be equal size! "
+                                 "( {} != {} )".format(size, len(paired_observations)))
+
+            paired_mean = float(paired_observations.sum() / size)
+            paired_deviations = paired_observations - paired_mean
+
+            paired_sum_of_squares = float(numpy.dot(paired_deviations, paired_deviations))
+            co_moment = float(numpy.dot(deviations, paired_deviations))
+
+        self.__combine(size, mean, float(numpy.dot(deviations, deviations)), paired_mean, paired_sum_of_squares,
+                       co_moment)
+
+        return self
+
+    def merge(self, other):
+        """
+        This function is used to merge the state of another sample (i.e. computed over another chunk of data) into
+        current one. Result is the same obtained updating a single sample with all observations.
+        """
+        if not isinstance(other, StreamingSimpleRandomSample):
+            raise ValueError("[ERROR]: 'other' must be a 'StreamingSimpleRandomSample' type object!")
+        if other.is_paired() != self.__is_paired:
+            raise ValueError("[ERROR]: Paired and unpaired samples cannot be merged!")
+
+        if other.get_size() != 0:
+            self.__combine(other.get_size(),
+                           other.get_mean(),
+                           other.get_sum_of_squares(),
+                           other.get_paired_mean() if self.__is_paired else 0.0,
+                           other.get_paired_sum_of_squares() if self.__is_paired else 0.0,
+                           other.get_co_moment() if self.__is_paired else 0.0)
+
+        return self
+
+    def __combine(self, size, mean, sum_of_squares, paired_mean, paired_sum_of_squares, co_moment):
+        """
+        This function is used to combine current state with the state of another set of observations.
+        """
+        total_size = self.__size + size
+        weight = self.__size * size / total_size
+
+        delta = mean - self.__mean
+        paired_delta = paired_mean - self.__paired_mean
+
+        self.__mean += delta * size / total_size
+        self.__sum_of_squares += sum_of_squares + delta * delta * weight
+
+        if self.__is_paired:
+            self.__paired_mean += paired_delta * size / total_size
+            self.__paired_sum_of_squares += paired_sum_of_squares + paired_delta * paired_delta * weight
+            self.__co_moment += co_moment + delta * paired_delta * weight
+
+        self.__size = total_size
+
+    def get_size(self):
+        return self.__size
+
+    def is_paired(self):
+        return self.__is_paired
+
+    def get_mean(self):
+        """
+        This function is used to get x^=_n(X), that is the sample mean of size n drawn from X
+        """
+        return self.__mean if self.__size != 0 else float("nan")
+
+    def get_sum_of_squares(self):
+        """
+        This function is used to get the sum of squared deviations of X from its sample mean
+        """
+        return self.__sum_of_squares
+
+    def get_unbiased_variance(self):
+        """
+        This function is used to get S^2_n(X), that is the unbiased sample variance of size n drawn from X
+        """
+        return self.__sum_of_squares / (self.__size - 1) if self.__size > 1 else float("nan")
+
+    def get_paired_mean(self):
+        """
+        This function is used to get y^=_n(Y), that is the sample mean of size n drawn from Y
+        """
+        self.__check_paired()
+        return self.__paired_mean if self.__size != 0 else float("nan")
+
+    def get_paired_sum_of_squares(self):
+        self.__check_paired()
+        return self.__paired_sum_of_squares
+
+    def get_paired_unbiased_variance(self):
+        """
+        This function is used to get S^2_n(Y), that is the unbiased sample variance of size n drawn from Y
+        """
+        self.__check_paired()
+        return self.__paired_sum_of_squares / (self.__size - 1) if self.__size > 1 else float("nan")
+
+    def get_co_moment(self):
+        """
+        This function is used to get the sum of products of deviations of X and Y from their sample means
+        """
+        self.__check_paired()
+        return self.__co_moment
+
+    def get_sample_covariance(self):
+        """
+        This function is used to get S_n(X,Y), that is the sample covariance of size n drawn from X and Y
+        """
+        self.__check_paired()
+        return self.__co_moment / (self.__size - 1) if self.__size > 1 else float("nan")
+
+    def __check_paired(self):
+        if not self.__is_paired:
+            raise ValueError("[ERROR]: Sample is NOT paired!")
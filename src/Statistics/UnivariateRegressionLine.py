@@ -1,75 +1,159 @@
+import heapq
+import math
+
 from src.Statistics.SimpleRandomSample import *
+from src.Statistics.StreamingSimpleRandomSample import StreamingSimpleRandomSample
 
 
 class UnivariateRegressionLine(object):
     """
     This class is used to compute an univariate regression line
+
+    The fit is computed from 'sufficient statistics' gathered in a single pass over observations, that is sample
+    size, means, sums of squared deviations and co-moment (see 'StreamingSimpleRandomSample'): they carry the same
+    information of (n, Σx, Σy, Σx², Σxy, Σy²), without losing precision when X values are large (i.e. timestamps).
+    TSS, ESS, SSE, standard errors, t-statistics and p-values are derived from them, with no further pass over data;
+    fitted values and residuals are computed only when requested.
     """
 
     def __init__(self, name, sample_x, sample_y):
 
-        self.__name = name
-
         if not isinstance(sample_x, SimpleRandomSample) or not isinstance(sample_y, SimpleRandomSample):
             raise ValueError("[ERROR]: 'sample_x' and 'sample_y' must be both 'SimpleRandomSample' type objects!")
 
         if sample_x.get_size() != sample_y.get_size():
             raise ValueError("[ERROR]: 'sample_x' and 'sample_y' must be equal size!")
 
-        self.sample_x = sample_x
-        self.sample_y = sample_y
-
-        self.__slope = None
-        self.__intercept = None
-        self.__fitted_values_y = None
-        self.__tss = 0
-        self.__ess = 0
-        self.__coefficient_of_determination = 0
-        self.__sse = 0
+        statistics = StreamingSimpleRandomSample(paired=True)
+        statistics.update(sample_x.get_observations(), sample_y.get_observations())
 
-        # Calc all information about current univariate regression line
-        self.__calc_slope_and_intercept()
-        self.__calc_fitted_values()
-        self.__calc_tss()
-        self.__calc_ess()
-        self.__calc_coefficient_of_determination()
+        self.__fit(name, sample_x, sample_y, statistics)
 
-    def __calc_slope_and_intercept(self):
+    @classmethod
+    def from_statistics(cls, name, statistics):
         """
-        This function is used to calc the 'slope' and the 'intercept'
+        This function is used to compute a regression line from the sufficient statistics of a paired
+        'StreamingSimpleRandomSample' object (i.e. merged from chunks of data). Since observations are not available,
+        fitted values and residuals cannot be computed.
         """
-        sample_covariance = SimpleRandomSample.calc_sample_covariance(self.sample_x, self.sample_y)
+        if not isinstance(statistics, StreamingSimpleRandomSample) or not statistics.is_paired():
+            raise ValueError("[ERROR]: 'statistics' must be a paired 'StreamingSimpleRandomSample' type object!")
 
-        self.__slope = sample_covariance / self.sample_x.get_unbiased_variance()
-        self.__intercept = self.sample_y.get_mean() - self.__slope * self.sample_x.get_mean()
+        output = cls.__new__(cls)
+        output.__fit(name, None, None, statistics)
 
-    def __calc_fitted_values(self):
-        """
-        This function is used to calc the fitted values of the dependent variable Y
-        """
-        self.__fitted_values_y = list()
-        for value in self.sample_x.get_observations():
-            self.__fitted_values_y.append(self.__intercept + self.__slope * value)
+        return output
 
-    def __calc_tss(self):
+    def __fit(self, name, sample_x, sample_y, statistics):
         """
-        This function is used to calc TSS, that is the Total Sum of Squares
+        This function is used to calc all information about current univariate regression line
         """
-        for value in self.sample_y.get_observations():
-            self.__tss += (value - self.sample_y.get_mean()) ** 2
+        self.__name = name
+
+        self.sample_x = sample_x
+        self.sample_y = sample_y
+
+        self.__size = statistics.get_size()
+        self.__mean_x = statistics.get_mean()
+
+        sum_of_squares_x = statistics.get_sum_of_squares()
+        co_moment = statistics.get_co_moment()
 
-    def __calc_ess(self):
+        # Slope and intercept (undefined when X values are all equal)...
+        # ========================================= #
+        self.__slope = co_moment / sum_of_squares_x if sum_of_squares_x != 0 else float("nan")
+        self.__intercept = statistics.get_paired_mean() - self.__slope * self.__mean_x
+
+        # TSS (Total), ESS (Explained) and SSE (Error) Sum of Squares...
+        # ========================================= #
+        self.__tss = statistics.get_paired_sum_of_squares()
+        self.__ess = self.__slope * co_moment
+        self.__sse = max(self.__tss - self.__ess, 0.0) if not math.isnan(self.__ess) else float("nan")
+
+        # R^2 is undefined when Y values are all equal...
+        self.__coefficient_of_determination = self.__ess / self.__tss if self.__tss != 0 else float("nan")
+
+        # Standard errors, t-statistics and p-values (n - 2 degrees of freedom)...
+        # ========================================= #
+        self.__degrees_of_freedom = self.__size - 2
+
+        if self.__degrees_of_freedom > 0 and sum_of_squares_x != 0:
+            residual_variance = self.__sse / self.__degrees_of_freedom
+
+            self.__slope_standard_error = math.sqrt(residual_variance / sum_of_squares_x)
+            self.__intercept_standard_error = math.sqrt(
+                residual_variance * (1 / self.__size + self.__mean_x ** 2 / sum_of_squares_x))
+        else:
+            self.__slope_standard_error = float("nan")
+            self.__intercept_standard_error = float("nan")
+
+        self.__slope_t_statistic = UnivariateRegressionLine.__calc_t_statistic(self.__slope,
+                                                                               self.__slope_standard_error)
+        self.__intercept_t_statistic = UnivariateRegressionLine.__calc_t_statistic(self.__intercept,
+                                                                                   self.__intercept_standard_error)
+
+        self.__fitted_values_y = None
+        self.__residuals_y = None
+
+    @staticmethod
+    def __calc_t_statistic(estimate, standard_error):
+        if math.isnan(standard_error):
+            return float("nan")
+        if standard_error == 0:
+            return math.copysign(math.inf, estimate) if estimate != 0 else float("nan")
+
+        return estimate / standard_error
+
+    @staticmethod
+    def __calc_two_sided_p_value(t_statistic, degrees_of_freedom):
         """
-        This function is used to calc ESS, that is the Explained Sum of Squares
+        This function is used to calc P(|T| >= |t|), where T follows a Student's t distribution, that is
+        I_z(v/2, 1/2) where I is the regularized incomplete beta function, v the degrees of freedom and z = v/(v + t^2)
         """
-        for value in self.__fitted_values_y:
-            self.__ess += (value - self.sample_y.get_mean()) ** 2
+        if math.isnan(t_statistic) or degrees_of_freedom <= 0:
+            return float("nan")
+        if math.isinf(t_statistic):
+            return 0.0
+
+        return UnivariateRegressionLine.__calc_regularized_incomplete_beta(
+            degrees_of_freedom / 2, 0.5, degrees_of_freedom / (degrees_of_freedom + t_statistic ** 2))
 
-    def __calc_coefficient_of_determination(self):
+    @staticmethod
+    def __calc_regularized_incomplete_beta(a, b, z):
         """
-        This function is used to calc the coefficient of determination, also known as R^2
+        This function is used to calc I_z(a, b), that is the regularized incomplete beta function, using its continued
+        fraction (evaluated by Lentz's method) where it converges quickly and symmetry I_z(a, b) = 1 - I_1-z(b, a)
+        elsewhere
         """
-        self.__coefficient_of_determination = self.__ess / self.__tss
+        if z <= 0:
+            return 0.0
+        if z >= 1:
+            return 1.0
+
+        if z > (a + 1) / (a + b + 2):
+            return 1 - UnivariateRegressionLine.__calc_regularized_incomplete_beta(b, a, 1 - z)
+
+        front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(z) + b * math.log1p(-z))
+
+        tiny = 1e-300
+        c = 1.0
+        d = 1 - (a + b) * z / (a + 1)
+        d = 1 / (d if abs(d) >= tiny else tiny)
+        output = d
+
+        for m in range(1, 1000):
+            for numerator in (m * (b - m) * z / ((a + 2 * m - 1) * (a + 2 * m)),
+                              -(a + m) * (a + b + m) * z / ((a + 2 * m) * (a + 2 * m + 1))):
+                d = 1 + numerator * d
+                d = 1 / (d if abs(d) >= tiny else tiny)
+                c = 1 + numerator / c
+                c = c if abs(c) >= tiny else tiny
+                output *= d * c
+
+            if abs(d * c - 1) < 1e-15:
+                break
+
+        return front * output / a
 
     def get_slope(self):
         return self.__slope
@@ -87,31 +171,108 @@ class UnivariateRegressionLine(object):
         return self.__coefficient_of_determination
 
     def get_fitted_values_y(self):
+        """
+        This function is used to get the fitted values of the dependent variable Y, computing them when first needed
+        """
+        if self.__fitted_values_y is None:
+            if self.sample_x is None:
+                raise ValueError("[ERROR]: Observations are NOT available!")
+
+            self.__fitted_values_y = self.__intercept + self.__slope * self.sample_x.get_observations()
+
         return self.__fitted_values_y
 
+    def get_residuals_y(self):
+        """
+        This function is used to get the residuals, that is the differences between the observed values of the
+        dependent variable Y and the fitted ones, computing them when first needed
+        """
+        if self.__residuals_y is None:
+            self.__residuals_y = self.sample_y.get_observations() - self.get_fitted_values_y()
+
+        return self.__residuals_y
+
     def get_sse(self):
         return self.__sse
 
+    def get_size(self):
+        return self.__size
+
+    def get_slope_standard_error(self):
+        return self.__slope_standard_error
+
+    def get_intercept_standard_error(self):
+        return self.__intercept_standard_error
+
+    def get_slope_t_statistic(self):
+        return self.__slope_t_statistic
+
+    def get_intercept_t_statistic(self):
+        return self.__intercept_t_statistic
+
+    def get_slope_p_value(self):
+        """
+        This function is used to get the p-value of the (two-sided) test of hypothesis 'slope = 0'
+        """
+        return UnivariateRegressionLine.__calc_two_sided_p_value(self.__slope_t_statistic, self.__degrees_of_freedom)
+
+    def get_intercept_p_value(self):
+        """
+        This function is used to get the p-value of the (two-sided) test of hypothesis 'intercept = 0'
+        """
+        return UnivariateRegressionLine.__calc_two_sided_p_value(self.__intercept_t_statistic,
+                                                                 self.__degrees_of_freedom)
+
     def get_name(self):
         return self.__name
 
     @staticmethod
-    def rank_regression_lines(lines):
+    def rank_regression_lines(lines, top_k=None):
         """
-        Function used to rank specified regression lines according to R^2 values.
+        Function used to rank specified regression lines according to R^2 values, from the best one (lines having
+        undefined R^2 are ranked last). Specified list is not altered. If 'top_k' is specified, only the best 'top_k' lines are ranked, selecting them using a heap.
+
+        It returns a list of 'dict' objects holding 'rank', 'name', 'slope', 'coefficient_of_determination', 'size' and
+        'is_worst' (telling whether it is the worst one of all specified lines) of each ranked line (use 'print_rank'
+        to print it).
         """
+        if not isinstance(lines, list):
+            raise ValueError("[ERROR]: 'lines' must be a 'list' type object!")
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 0):
+            raise ValueError("[ERROR]: 'top_k' must be a non-negative 'int' or 'None'!")
+
+        # Lines having undefined R^2 (i.e. fitted over constant series) are ranked last...
+        def key(x):
+            return -math.inf if math.isnan(x.get_coefficient_of_determination()) else \
+                x.get_coefficient_of_determination()
+
+        if top_k is None:
+            ranked_lines = sorted(lines, key=key, reverse=True)
+        else:
+            ranked_lines = heapq.nlargest(top_k, lines, key=key)
+
+        output = list()
+        for rank, regression_line in enumerate(ranked_lines, start=1):
+            output.append({"rank": rank,
+                           "name": regression_line.get_name(),
+                           "slope": regression_line.get_slope(),
+                           "coefficient_of_determination": regression_line.get_coefficient_of_determination(),
+                           "size": regression_line.get_size(),
+                           "is_worst": rank == len(lines)})
 
-        # Sort...
-        lines.sort(key=lambda x: x.get_coefficient_of_determination())
-        lines.reverse()
+        return output
 
-        rank = 1
-        for regression_line in lines:
-            print("{}° {:<25}  R^2: {}".format(rank,
-                                               regression_line.get_name().upper(),
-                                               regression_line.get_coefficient_of_determination(),
+    @staticmethod
+    def print_rank(rank, show_worst=True):
+        """
+        Function used to print a rank of regression lines, as returned by 'rank_regression_lines'. If 'show_worst' is
+        'True' and the rank holds all lines, last ranked line is reported as the worst one.
+        """
+        for entry in rank:
+            print("{}° {:<25}  R^2: {}".format(entry["rank"],
+                                               entry["name"].upper(),
+                                               entry["coefficient_of_determination"],
                                                ))
-            rank += 1
 
-        worst_state = lines[len(lines) - 1].get_name()
-        print("\n{} has the WORST regression line!".format(worst_state.upper()))
+        if show_worst and len(rank) != 0 and rank[-1]["is_worst"]:
+            print("\n{} has the WORST regression line!".format(rank[-1]["name"].upper()))
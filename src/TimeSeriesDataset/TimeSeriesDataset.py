@@ -1,35 +1,292 @@
-import numpy
-import pandas
+import hashlib
+import os
+import tempfile
+
+from src import Common
+from src.TimeSeriesDataset.TimeSeriesDatasetCache import TimeSeriesDatasetCache
+from src.TimeSeriesDataset.TimeSeriesDatasetPartitionedStore import TimeSeriesDatasetPartitionedStore
+
+numpy = Common.lazy_import("numpy")
+pandas = Common.lazy_import("pandas")
 
 
 class TimeSeriesDataset(object):
     """
     This class is used to manage a 'Time Series' dataset.
+
+    When 'partitioning' is set to 'state' or 'state_and_decade', data are not loaded into memory: they are kept inside
+    a partitioned store, split by 'partition_column' values (and by decade), from which subclasses read only the
+    partitions they need. Partitioning is ignored by datasets without a 'partition_column'.
+
+    Data are kept sorted by 'sort_columns' and 'Time', so that all records of a group are contiguous; sorting is done
+    before data are cached, so it is paid only when the file is parsed.
     """
 
-    def __init__(self, name, file):
+    # Following variables are used to partition data (see 'TimeSeriesDatasetPartitionedStore')...
+    partition_column = None
+    catalog_column = None
+
+    # Following variable is used to sort data at load by these columns (and then by 'Time')...
+    sort_columns = list()
+
+    def __init__(self, name, file, use_cache=True, use_memory_map=False, partitioning=None):
+
+        if use_memory_map and not use_cache:
+            raise ValueError("[ERROR]: 'use_memory_map' requires 'use_cache'!")
+        if partitioning not in [None, "state", "state_and_decade"]:
+            raise ValueError("[ERROR]: 'partitioning' must be 'None', 'state' or 'state_and_decade'!")
 
         self.__file = file
+        self.__file_state = None
+        self.__cache = TimeSeriesDatasetCache(file) if use_cache else None
+        self.__use_memory_map = use_memory_map
+        self.__partitioning = partitioning if self.partition_column is not None else None
 
         self._name = name
         self._data = None
+        self._partitions = None
         self._time_range = None
         self._numeric_type_columns = None
+        self._memory_usage = None
+
+        self.__load()
+
+    def __load(self):
+        """
+        This function is used to load the whole dataset.
+        """
+        # File state is taken before reading, so rows appended meanwhile are picked up by next 'refresh'...
+        self.__file_state = self.__compute_file_state()
+
+        if self.__partitioning is not None:
+            self.__open_partitions(self.__partitioning == "state_and_decade")
+            self._time_range = self._partitions.get_time_range()
+            self._numeric_type_columns = self._partitions.get_numeric_type_columns()
+        else:
+            self.__read_data()
+            self.__compute_time_range()
+            self.__compute_numeric_type_columns()
+
+    def refresh(self):
+        """
+        This function is used to pick up changes of dataset file.
+
+        If rows have only been appended to the file, just the new tail is parsed and merged into current data;
+        otherwise (or in 'partitioned' mode) the whole dataset is read again. Derived data affected by the change are
+        invalidated (see '_on_data_changed'). It returns the number of parsed rows.
+        """
+        file_state = self.__compute_file_state()
+
+        if file_state["size"] == self.__file_state["size"] and file_state["mtime_ns"] == self.__file_state["mtime_ns"]:
+            return 0
+
+        if self.__partitioning is None and self.__is_append_only_change():
+            appended_data = self.__read_appended_data()
+            self.__file_state = file_state
+
+            if len(appended_data) != 0:
+                self.__merge_appended_data(appended_data)
+
+            self._on_data_changed(appended_data)
+            return len(appended_data)
+
+        self._memory_usage = None
+        self.__load()
+        self._on_data_changed(None)
+
+        return self._partitions.get_size() if self._partitions is not None else len(self._data)
+
+    def _on_data_changed(self, appended_data):
+        """
+        This function is called when dataset file changes: 'appended_data' holds new rows or, if the whole dataset
+        has been read again, it is 'None'. Subclasses override it to invalidate their derived data.
+        """
+        pass
+
+    def __compute_file_state(self, size=None):
+        """
+        This function is used to get size and modification time of dataset file, together with the digests of the
+        first and the last 4 KiB of its first 'size' bytes (whole file by default).
+        """
+        status = os.stat(self.__file)
+        size = status.st_size if size is None else size
+
+        with open(self.__file, "rb") as file:
+            head = file.read(min(size, 4096))
+            file.seek(max(size - 4096, 0))
+            tail = file.read(min(size, 4096))
+
+        return {"size": size,
+                "mtime_ns": status.st_mtime_ns,
+                "head_digest": hashlib.sha1(head).hexdigest(),
+                "tail_digest": hashlib.sha1(tail).hexdigest()}
+
+    def __is_append_only_change(self):
+        """
+        This function is used to check if dataset file has only grown, leaving already read bytes untouched.
+        """
+        size = self.__file_state["size"]
+
+        if os.path.getsize(self.__file) <= size:
+            return False
+
+        file_state = self.__compute_file_state(size)
+        if file_state["head_digest"] != self.__file_state["head_digest"] \
+                or file_state["tail_digest"] != self.__file_state["tail_digest"]:
+            return False
+
+        # Already read bytes must end with a complete line...
+        with open(self.__file, "rb") as file:
+            file.seek(size - 1)
+            return file.read(1) == b"\n"
+
+    def __read_appended_data(self):
+        """
+        This function is used to parse only the rows appended to dataset file since it was read.
+        Appended bytes are copied, after the header, into a temporary file, which is parsed using 'read_file'.
+        """
+        with open(self.__file, "rb") as file:
+            header = file.readline()
+            file.seek(self.__file_state["size"])
+            appended_bytes = file.read()
+
+        descriptor, temporary_path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(header)
+                file.write(appended_bytes)
+
+            return self.read_file(temporary_path)
+        finally:
+            os.remove(temporary_path)
+
+    def __merge_appended_data(self, appended_data):
+        """
+        This function is used to append new rows to current data, updating time range and cache.
+        """
+        columns = dict()
+        for column in self._data.columns:
+            if isinstance(self._data[column].dtype, pandas.CategoricalDtype):
+                # Categories are kept sorted, so that codes follow alphabetical order (see '__sort_data')...
+                columns[column] = pandas.api.types.union_categoricals([self._data[column].array,
+                                                                       appended_data[column].array],
+                                                                      sort_categories=True)
+            else:
+                columns[column] = numpy.concatenate([self._data[column].to_numpy(),
+                                                     appended_data[column].to_numpy()])
 
-        self.__read_data()
-        self.__compute_time_range()
-        self.__compute_numeric_type_columns()
+        data = pandas.DataFrame(columns,
+                                index=self._data.index.append(appended_data.index),
+                                columns=self._data.columns,
+                                copy=False)
+        data.index.name = 'Time'
+
+        self._data = self.__sort_data(data)
+        self._memory_usage = None
+
+        self._time_range = [min(self._time_range[0], appended_data.index.min()),
+                            max(self._time_range[1], appended_data.index.max())]
+
+        if self.__cache is not None:
+            try:
+                self.__cache.store(self._data)
+            except OSError as error:
+                print("[WARNING]: Unable to write cache of '{}'! ({})".format(self.__file, error))
+            else:
+                if self.__use_memory_map:
+                    self._data = self.__cache.load(True)
 
     def __read_data(self):
         """
         This function is used to read data from file-system.
+
+        When cache is enabled, data are read from a binary 'columnar' cache, which is (re)built from the source file
+        when missing or stale. In 'memory map' mode, columns are read-only views over cached files, shared among
+        all processes reading the same dataset.
+        """
+        if self.__cache is not None:
+            self._data = self.__cache.load(self.__use_memory_map)
+            if self._data is not None:
+                return
+
+        self._data = self.__sort_data(self.read_file(self.__file, TimeSeriesDataset.__print_reading_progress))
+
+        if self.__cache is not None:
+            try:
+                self.__cache.store(self._data)
+            except OSError as error:
+                if self.__use_memory_map:
+                    raise
+                print("[WARNING]: Unable to write cache of '{}'! ({})".format(self.__file, error))
+
+            # Drop private copy in favour of the shared one...
+            if self.__use_memory_map:
+                self._data = self.__cache.load(True)
+
+    def __open_partitions(self, partition_by_decade):
+        """
+        This function is used to open the partitioned store of current dataset, building it if missing or stale.
+        """
+        self._partitions = TimeSeriesDatasetPartitionedStore(self.__file,
+                                                             self.partition_column,
+                                                             self.catalog_column,
+                                                             partition_by_decade)
+
+        if not self._partitions.is_valid():
+            data = self.__cache.load() if self.__cache is not None else None
+            if data is None:
+                data = self.__sort_data(self.read_file(self.__file, TimeSeriesDataset.__print_reading_progress))
+
+            self._partitions.build(data)
+
+    def _get_partitioned_data(self, keys=None, decades=None):
         """
+        This function is used to read only specified partitions of current dataset.
+        """
+        return self._partitions.load(keys, decades, self.__use_memory_map)
 
-        self._data = pandas.read_csv(self.__file,
-                                     index_col=0,
-                                     header=0,
-                                     parse_dates=True)
-        self._data.index.name = 'Time'
+    @classmethod
+    def read_file(cls, file, progress_callback=None):
+        """
+        This function is used to parse specified file. It returns a 'pandas.DataFrame' object indexed by 'Time'.
+
+        If specified, 'progress_callback(read_rows, total_rows)' is used to report reading progress.
+        """
+        output = pandas.read_csv(file,
+                                 index_col=0,
+                                 header=0,
+                                 parse_dates=True)
+        output.index.name = 'Time'
+
+        if progress_callback is not None:
+            progress_callback(len(output), len(output))
+
+        return output
+
+    def __sort_data(self, data):
+        """
+        This function is used to sort specified data by 'sort_columns' (if present) and 'Time'. Sort is stable and
+        data already sorted are returned as they are.
+        """
+        keys = [data.index.values]
+        for column in reversed(self.sort_columns):
+            if column in data.columns:
+                values = data[column]
+                # Categorical columns are sorted by their (sorted) categories, using codes...
+                keys.append(values.cat.codes.to_numpy() if isinstance(values.dtype, pandas.CategoricalDtype)
+                            else values.to_numpy())
+
+        order = numpy.lexsort(keys)
+        if numpy.all(order[1:] > order[:-1]):
+            return data
+
+        return data.take(order)
+
+    @staticmethod
+    def __print_reading_progress(read_rows, total_rows):
+        percentage = 100 if total_rows == 0 else 100 * read_rows // total_rows
+        print("\r-> Reading... {}% ({}/{} rows)".format(percentage, read_rows, total_rows),
+              end="\n" if read_rows == total_rows else "")
 
     def __compute_time_range(self):
         """
@@ -46,6 +303,21 @@ class TimeSeriesDataset(object):
         """
         self._numeric_type_columns = self._data.select_dtypes(include=[numpy.number]).columns.tolist()
 
+    def get_summary(self):
+        """
+        This function is used to get a summary of current dataset, as stored by 'TimeSeriesDatasetManifest'.
+        """
+        return {"dataset_class": type(self).__name__,
+                "columns": self.get_columns(),
+                "numeric_type_columns": self._numeric_type_columns,
+                "time_range": [x.isoformat() for x in self._time_range]}
+
+    def get_columns(self):
+        if self._partitions is not None:
+            return self._partitions.get_columns()
+
+        return self._data.columns.tolist()
+
     def get_numeric_type_columns(self):
         return self._numeric_type_columns
 
@@ -55,8 +327,38 @@ class TimeSeriesDataset(object):
     def get_time_range_as_years(self):
         return [self._time_range[0].year, self._time_range[1].year]
 
+    def get_row_count(self):
+        """
+        This function is used to get the number of rows of current dataset, without reading partitions.
+        """
+        if self._partitions is not None:
+            return self._partitions.get_size()
+
+        return len(self._data)
+
+    def get_memory_usage(self):
+        """
+        This function is used to get the number of bytes used by data of current dataset.
+        """
+        if self._memory_usage is None:
+            if self._data is None:
+                self._memory_usage = 0
+            else:
+                self._memory_usage = int(self._data.memory_usage(index=True, deep=True).sum())
+
+        return self._memory_usage
+
     def get_data(self):
+        """
+        This function is used to get all data of current dataset. In 'partitioned' mode, all partitions are read.
+        """
+        if self._partitions is not None:
+            return self._get_partitioned_data()
+
         return self._data
 
+    def is_partitioned(self):
+        return self._partitions is not None
+
     def get_name(self):
         return self._name
@@ -0,0 +1,165 @@
+import json
+import os
+
+from src import Common
+
+numpy = Common.lazy_import("numpy")
+pandas = Common.lazy_import("pandas")
+
+
+class TimeSeriesDatasetCache(object):
+    """
+    This class is used to manage a binary 'columnar' sidecar cache of a 'Time Series' dataset file.
+
+    Every column is stored inside its own '.npy' file: numeric columns are stored as they are (preserving their
+    'dtype'), while categorical and string columns are stored as integer codes together with their categories.
+    The cache is considered valid as long as 'size' and 'modification time' of the source file do not change;
+    otherwise it is rebuilt.
+    """
+
+    manifest_file_name = "manifest.json"
+
+    # Increase following value whenever cached data layout changes, in order to invalidate old caches...
+    format_version = 4
+
+    def __init__(self, file, cache_directory=None):
+
+        if not isinstance(file, str):
+            raise TypeError("[ERROR]: 'file' must be 'str' type.")
+
+        if cache_directory is None:
+            directory, file_name = os.path.split(file)
+            cache_directory = os.path.join(directory, ".cache", file_name)
+
+        self.__file = file
+        self.__directory = cache_directory
+
+    def get_directory(self):
+        return self.__directory
+
+    def get_file_fingerprint(self):
+        """
+        This function is used to get the 'fingerprint' of the source file, that is its size and modification time.
+        """
+        status = os.stat(self.__file)
+        return {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+    def is_valid(self):
+        """
+        This function is used to check if cached data are still consistent with the source file.
+        """
+        manifest = self.__read_manifest()
+        return manifest is not None \
+            and manifest.get("format_version") == TimeSeriesDatasetCache.format_version \
+            and manifest["fingerprint"] == self.get_file_fingerprint()
+
+    def load(self, memory_map=False):
+        """
+        This function is used to load cached data. It returns 'None' when cache is missing or stale.
+
+        If 'memory_map' is set, numeric columns and categorical codes are backed by read-only memory-mapped files
+        instead of private copies, so that several processes reading the same dataset share a single copy of it
+        inside the page cache.
+        """
+        if not self.is_valid():
+            return None
+
+        manifest = self.__read_manifest()
+        memory_map_mode = "r" if memory_map else None
+
+        index = pandas.DatetimeIndex(self.__load_array("index.npy", memory_map_mode),
+                                     name=manifest["index"],
+                                     copy=False)
+
+        columns = dict()
+        for k, column in enumerate(manifest["columns"]):
+
+            if column["kind"] == "numeric":
+                columns[column["name"]] = self.__load_array("column_{}.npy".format(k), memory_map_mode)
+            else:
+                codes = self.__load_array("column_{}_codes.npy".format(k), memory_map_mode)
+                categories = self.__load_array("column_{}_categories.npy".format(k)).astype(object)
+                columns[column["name"]] = pandas.Categorical.from_codes(codes, categories)
+
+                if column["kind"] == "string":
+                    columns[column["name"]] = columns[column["name"]].astype(object)
+
+        return pandas.DataFrame(columns,
+                                index=index,
+                                columns=[column["name"] for column in manifest["columns"]],
+                                copy=False)
+
+    def store(self, data):
+        """
+        This function is used to store specified 'pandas.DataFrame' object into the cache.
+
+        The manifest is written last, so an interrupted write leaves an invalid cache, never a corrupted one.
+        Every file is written aside and then moved into place, so files memory-mapped by other processes are never
+        modified.
+        """
+        if not isinstance(data, pandas.DataFrame):
+            raise TypeError("[ERROR]: 'data' must be 'pandas.DataFrame' type.")
+
+        fingerprint = self.get_file_fingerprint()
+
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__remove_manifest()
+
+        self.__save_array("index.npy", data.index.values)
+
+        columns = list()
+        for k, name in enumerate(data.columns):
+
+            values = data[name]
+
+            if isinstance(values.dtype, pandas.CategoricalDtype):
+                codes, categories = values.cat.codes.to_numpy(), values.cat.categories
+                kind = "category"
+            elif pandas.api.types.is_numeric_dtype(values):
+                self.__save_array("column_{}.npy".format(k), values.to_numpy())
+                columns.append({"name": name, "kind": "numeric"})
+                continue
+            else:
+                codes, categories = pandas.factorize(values)
+                kind = "string"
+
+            self.__save_array("column_{}_codes.npy".format(k), codes)
+            self.__save_array("column_{}_categories.npy".format(k), numpy.asarray(categories, dtype=str))
+            columns.append({"name": name, "kind": kind})
+
+        manifest = {"format_version": TimeSeriesDatasetCache.format_version,
+                    "fingerprint": fingerprint,
+                    "index": data.index.name,
+                    "columns": columns}
+
+        temporary_path = self.__path(TimeSeriesDatasetCache.manifest_file_name + ".tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temporary_path, self.__path(TimeSeriesDatasetCache.manifest_file_name))
+
+    def __path(self, file_name):
+        return os.path.join(self.__directory, file_name)
+
+    def __load_array(self, file_name, memory_map_mode=None):
+        return numpy.load(self.__path(file_name), mmap_mode=memory_map_mode, allow_pickle=False)
+
+    def __save_array(self, file_name, array):
+        temporary_path = self.__path(file_name + ".tmp.npy")
+        numpy.save(temporary_path, array)
+        os.replace(temporary_path, self.__path(file_name))
+
+    def __read_manifest(self):
+        """
+        This function is used to read cache's manifest. It returns 'None' if it does not exist or it is unreadable.
+        """
+        try:
+            with open(self.__path(TimeSeriesDatasetCache.manifest_file_name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def __remove_manifest(self):
+        try:
+            os.remove(self.__path(TimeSeriesDatasetCache.manifest_file_name))
+        except FileNotFoundError:
+            pass
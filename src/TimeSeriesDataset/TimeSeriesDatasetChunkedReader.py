@@ -0,0 +1,195 @@
+import os
+
+from src import Common
+
+numpy = Common.lazy_import("numpy")
+pandas = Common.lazy_import("pandas")
+
+
+class TimeSeriesDatasetChunkedReader(object):
+    """
+    This class is used to read a 'Time Series' CSV file in fixed-size chunks, with bounded peak memory.
+
+    Rows are counted first, so that final arrays can be preallocated using their final compact 'dtype'; then every
+    chunk is converted and copied straight into them. Categorical columns are stored as integer codes while reading,
+    so no column of Python strings ever exists for the whole file.
+
+    When a 'memory_limit' (in bytes) is specified, chunk size is reduced so that final arrays plus the chunk being
+    parsed fit inside it; a 'MemoryError' is raised if this is not possible. Final arrays are never copied: output
+    'pandas.DataFrame' object is built on top of them and categorical codes are remapped in place.
+    """
+
+    # Conservative estimate of bytes needed by 'pandas.read_csv' to parse one byte of CSV text...
+    parsing_overhead = 8
+
+    # Bytes reserved for read buffers, parser state and category names, whatever chunk size is...
+    reserved_memory = 2 * 1024 ** 2
+
+    # Bytes per row of the temporaries used to remap a block of categorical codes (i.e. 'intp' indexes and result)...
+    remapping_overhead = 16
+
+    # Bytes per row of smaller codes built by 'pandas.Categorical' when there are few categories (i.e. 'int8')...
+    downcast_overhead = 2
+
+    def __init__(self, file, dtype, date_format, chunk_size=250000, memory_limit=None):
+
+        if not isinstance(file, str):
+            raise TypeError("[ERROR]: 'file' must be 'str' type.")
+        if not isinstance(dtype, dict):
+            raise TypeError("[ERROR]: 'dtype' must be 'dict' type.")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("[ERROR]: 'chunk_size' must be a positive 'int'!")
+        if memory_limit is not None and (not isinstance(memory_limit, int) or memory_limit <= 0):
+            raise ValueError("[ERROR]: 'memory_limit' must be a positive 'int' or 'None'!")
+
+        self.__file = file
+        self.__dtype = dtype
+        self.__date_format = date_format
+        self.__chunk_size = chunk_size
+        self.__memory_limit = memory_limit
+
+    def read(self, progress_callback=None):
+        """
+        This function is used to read the whole file. It returns a 'pandas.DataFrame' object indexed by 'Time'.
+
+        If specified, 'progress_callback(read_rows, total_rows)' is invoked after each chunk.
+        """
+        header = pandas.read_csv(self.__file, nrows=0).columns
+        columns = header[1:].tolist()
+        total_rows = self.__count_rows()
+
+        # Preallocate final arrays...
+        # ========================================= #
+        index = numpy.empty(total_rows, dtype="datetime64[ns]")
+        arrays = dict()
+        categories = dict()
+
+        for column in columns:
+            if self.__dtype.get(column) == "category":
+                arrays[column] = numpy.empty(total_rows, dtype=numpy.int32)
+                categories[column] = dict()
+            else:
+                arrays[column] = numpy.empty(total_rows, dtype=self.__dtype.get(column, numpy.float64))
+
+        bytes_per_row = index.itemsize + sum(x.itemsize for x in arrays.values())
+        if len(categories) != 0:
+            bytes_per_row += TimeSeriesDatasetChunkedReader.downcast_overhead
+
+        chunk_size = self.__compute_chunk_size(total_rows, bytes_per_row)
+
+        # Fill them chunk by chunk...
+        # ========================================= #
+        dtype = dict(self.__dtype)
+        dtype[header[0]] = str
+
+        offset = 0
+        for chunk in pandas.read_csv(self.__file, index_col=0, header=0, dtype=dtype, chunksize=chunk_size):
+
+            size = len(chunk)
+
+            index[offset:offset + size] = pandas.to_datetime(chunk.index, format=self.__date_format).values
+
+            for column in columns:
+                if column in categories:
+                    arrays[column][offset:offset + size] = \
+                        TimeSeriesDatasetChunkedReader.__encode(chunk[column], categories[column])
+                else:
+                    arrays[column][offset:offset + size] = chunk[column].to_numpy()
+
+            offset += size
+
+            if progress_callback is not None:
+                progress_callback(offset, total_rows)
+
+        # Build output, dropping unused preallocated rows (i.e. blank lines)...
+        # ========================================= #
+        # Code arrays are released one by one, so at most one set of downcast codes exists beside them...
+        data = dict()
+        for column in columns:
+            if column in categories:
+                data[column] = TimeSeriesDatasetChunkedReader.__decode(arrays.pop(column)[:offset], categories[column],
+                                                                       chunk_size)
+            else:
+                data[column] = arrays[column][:offset]
+
+        return pandas.DataFrame(data, index=pandas.DatetimeIndex(index[:offset], name="Time", copy=False),
+                                columns=columns, copy=False)
+
+    def __count_rows(self):
+        """
+        This function is used to count data rows of the file, scanning it in binary blocks.
+        """
+        output = 0
+        last_byte = b"\n"
+
+        with open(self.__file, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                output += block.count(b"\n")
+                last_byte = block[-1:]
+
+        if last_byte != b"\n":
+            output += 1
+
+        # Header is not a data row...
+        return max(output - 1, 0)
+
+    def __compute_chunk_size(self, total_rows, bytes_per_row):
+        """
+        This function is used to compute the number of rows per chunk respecting the memory limit, if any.
+        """
+        if self.__memory_limit is None:
+            return self.__chunk_size
+
+        final_size = total_rows * bytes_per_row + TimeSeriesDatasetChunkedReader.reserved_memory
+        if final_size >= self.__memory_limit:
+            raise MemoryError("[ERROR]: '{}' needs at least {} bytes, but memory limit is {} bytes!".format(
+                self.__file, final_size, self.__memory_limit))
+
+        # Chunks are also used as blocks to remap categorical codes, after parsing...
+        average_row_length = os.path.getsize(self.__file) / max(total_rows, 1)
+        bytes_per_parsed_row = max(int(average_row_length * TimeSeriesDatasetChunkedReader.parsing_overhead) + 1,
+                                   TimeSeriesDatasetChunkedReader.remapping_overhead)
+
+        output = min(self.__chunk_size, (self.__memory_limit - final_size) // bytes_per_parsed_row)
+        if output < 1:
+            raise MemoryError("[ERROR]: Memory limit of {} bytes is too low to read '{}'!".format(
+                self.__memory_limit, self.__file))
+
+        return output
+
+    @staticmethod
+    def __encode(values, mapping):
+        """
+        This function is used to convert a categorical chunk into codes shared by all chunks, extending 'mapping'
+        with new categories.
+        """
+        chunk_categories = values.cat.categories.tolist()
+        lookup = numpy.empty(len(chunk_categories) + 1, dtype=numpy.int32)
+
+        for k, category in enumerate(chunk_categories):
+            lookup[k] = mapping.setdefault(category, len(mapping))
+
+        # Code '-1' (missing value) is mapped on last slot...
+        lookup[-1] = -1
+
+        return lookup[values.cat.codes.to_numpy()]
+
+    @staticmethod
+    def __decode(codes, mapping, block_size):
+        """
+        This function is used to build a 'pandas.Categorical' object with sorted categories from codes and mapping.
+        Codes are remapped in place, 'block_size' codes at a time.
+        """
+        categories = numpy.array(list(mapping.keys()), dtype=object)
+        order = numpy.argsort(categories, kind="stable")
+
+        # Remap codes according to sorted categories, keeping '-1' for missing values...
+        remap = numpy.empty(len(order) + 1, dtype=numpy.int32)
+        remap[order] = numpy.arange(len(order), dtype=numpy.int32)
+        remap[-1] = -1
+
+        for start in range(0, len(codes), block_size):
+            block = codes[start:start + block_size]
+            block[:] = remap[block]
+
+        return pandas.Categorical.from_codes(codes, categories[order])
@@ -1,194 +1,897 @@
 import calendar
 
-import numpy
-import pandas
-
+from src import Common
 from src.Statistics.SimpleRandomSample import SimpleRandomSample
 from src.Statistics.UnivariateRegressionLine import UnivariateRegressionLine
 from src.TimeSeriesDataset.TimeSeriesDataset import TimeSeriesDataset
+from src.TimeSeriesDataset.TimeSeriesDatasetChunkedReader import TimeSeriesDatasetChunkedReader
+from src.TimeSeriesDataset.TimeSeriesDatasetResultCache import TimeSeriesDatasetResultCache
+
+numpy = Common.lazy_import("numpy")
+pandas = Common.lazy_import("pandas")
 
 
 class TimeSeriesDatasetGlobalClimateChange(TimeSeriesDataset):
     """
     This class is used to manage a 'Time Series' dataset regarding 'Global Climate Change' data.
 
-    All data about all available 'State' and 'City', including 'State'-'Cities' mapping, are collected 'lazily',
-    that is they are built only when needed.
+    Data are sorted by 'Country', 'City' and 'Time'. At load, all data about all available 'State' and 'City',
+    including 'State'-'Cities' mapping, are collected into a 'place index', which also stores the range of rows of
+    every 'State' and 'City': in this way, 'State' and 'City' filters are slices, whose cost does not depend on
+    dataset size. Month and year of every row are also computed once, as compact integer arrays ('calendar index').
+
+    Results of queries (i.e. 'get_filtered_data') are kept inside a 'TimeSeriesDatasetResultCache' object, bounded by
+    'result_cache_memory_budget' bytes, so that repeated queries are answered without filtering data again.
     """
 
     # Following variable is used for 'month name' to 'month index' conversion...
     month_calendar_map = dict(
         (month_name, month_index) for month_name, month_index in zip(calendar.month_name[1:], range(1, 13)))
 
-    def __init__(self, name, file):
-        super().__init__(name, file)
+    # Following variables describe the 'schema' of 'Global Climate Change' CSV files...
+    date_format = "%Y-%m-%d"
+    place_columns = ["Country", "State", "City"]
+    coordinate_columns = ["Latitude", "Longitude"]
+    measurement_dtype = "float32"
+
+    # Following variables are used to bound memory used while reading CSV files ('None' means no limit)...
+    ingestion_chunk_size = 250000
+    ingestion_memory_limit = 1024 ** 3
+
+    # Following variables are used to partition data (see 'TimeSeriesDatasetPartitionedStore')...
+    partition_column = "Country"
+    catalog_column = "City"
+    sort_columns = ["Country", "City"]
+
+    # Following variable is used to bound memory used by results of recent queries...
+    result_cache_memory_budget = 64 * 1024 ** 2
+
+    def __init__(self, name, file, use_cache=True, use_memory_map=False, partitioning=None):
+        super().__init__(name, file, use_cache, use_memory_map, partitioning)
 
         self.__city_list = None
         self.__state_list = None
 
-        self.__state_to_city_map = dict()
+        self.__state_index = dict()
+        self.__city_index = dict()
         self.__city_to_state_map = dict()
 
+        self.__months = None
+        self.__years = None
+
+        self.__result_cache = TimeSeriesDatasetResultCache(self.result_cache_memory_budget)
+
+        self.__exclude_coordinate_columns()
+        self.__build_place_index()
+        self.__build_calendar_index()
+
+    def __exclude_coordinate_columns(self):
+        """
+        This function is used to remove coordinates from numeric columns: they are numeric but not measurements.
+        """
+        self._numeric_type_columns = [x for x in self._numeric_type_columns
+                                      if x not in TimeSeriesDatasetGlobalClimateChange.coordinate_columns]
+
+    def __build_place_index(self):
+        """
+        This function is used to build the whole 'State'-'City' hierarchy of current dataset at once. For every
+        'State' and every 'State'-'City' pair it stores the number of rows, the time range and, when data are in
+        memory, the (contiguous) range of rows holding its records.
+        """
+        self.__state_index = dict()
+        self.__city_index = dict()
+        self.__city_to_state_map = dict()
+
+        if self._partitions is not None:
+            self.__build_partitioned_place_index()
+        elif self._data is not None and "Country" in self._data.columns and len(self._data) != 0:
+            self.__build_in_memory_place_index()
+
+        self.__state_list = list(self.__state_index.keys())
+        self.__city_list = list(self.__city_to_state_map.keys())
+
+    def __build_in_memory_place_index(self):
+        """
+        This function is used to build the place index scanning sorted codes once: every group of rows sharing the
+        same 'State' and 'City' is found, then 'State' entries are built merging their (adjacent) 'City' groups.
+        """
+        group_columns = [x for x in ["Country", "City"] if x in self._data.columns]
+        codes = [self._data[x].cat.codes.to_numpy() for x in group_columns]
+        categories = [self._data[x].cat.categories for x in group_columns]
+
+        # A group starts where any of its codes changes...
+        is_group_start = numpy.zeros(len(self._data), dtype=bool)
+        is_group_start[0] = True
+        for x in codes:
+            is_group_start[1:] |= x[1:] != x[:-1]
+
+        starts = numpy.flatnonzero(is_group_start)
+        stops = numpy.append(starts[1:], len(self._data))
+
+        time = self._data.index.values
+        first_times = pandas.DatetimeIndex(numpy.minimum.reduceat(time, starts))
+        last_times = pandas.DatetimeIndex(numpy.maximum.reduceat(time, starts))
+
+        for k, (start, stop) in enumerate(zip(starts.tolist(), stops.tolist())):
+
+            key = [x[start] for x in codes]
+            if key[0] < 0:
+                continue
+
+            state = categories[0][key[0]]
+            time_range = [first_times[k], last_times[k]]
+
+            entry = self.__state_index.get(state)
+            if entry is None:
+                entry = {"rows": slice(start, stop),
+                         "row_count": 0,
+                         "time_range": time_range,
+                         "cities": list() if len(key) == 2 else None}
+                self.__state_index[state] = entry
+
+            entry["rows"] = slice(entry["rows"].start, stop)
+            entry["row_count"] += stop - start
+            entry["time_range"] = [min(entry["time_range"][0], time_range[0]),
+                                   max(entry["time_range"][1], time_range[1])]
+
+            if len(key) == 2 and key[1] >= 0:
+                city = categories[1][key[1]]
+
+                entry["cities"].append(city)
+                self.__city_index[(state, city)] = {"rows": slice(start, stop),
+                                                    "row_count": stop - start,
+                                                    "time_range": time_range}
+                self.__city_to_state_map.setdefault(city, state)
+
+    def __build_partitioned_place_index(self):
+        """
+        This function is used to build the place index from the catalog of the partitioned store, without reading
+        any partition.
+        """
+        for state in self._partitions.get_keys():
+
+            cities = self._partitions.get_catalog(state)
+
+            entry = dict(self._partitions.get_statistics(state))
+            entry["rows"] = None
+            entry["cities"] = cities
+            self.__state_index[state] = entry
+
+            for city in cities or list():
+                entry = dict(self._partitions.get_statistics(state, city))
+                entry["rows"] = None
+                self.__city_index[(state, city)] = entry
+                self.__city_to_state_map.setdefault(city, state)
+
+    def __build_calendar_index(self):
+        """
+        This function is used to store month ('int8') and year ('int16') of every row of whole dataset data, so that
+        'Month' and 'time range' filters do not compute them again from 'Time' index. Nothing is done in
+        'partitioned' mode.
+        """
+        if self._data is None:
+            self.__months = None
+            self.__years = None
+        else:
+            self.__months = self._data.index.month.to_numpy().astype(numpy.int8)
+            self.__years = self._data.index.year.to_numpy().astype(numpy.int16)
+
+    def _on_data_changed(self, appended_data):
+        """
+        This function is used to rebuild 'State' and 'City' data after a change of dataset file.
+        """
+        # Appended rows are merged in sorted order, so row ranges of all groups can change...
+        self.__build_place_index()
+        self.__build_calendar_index()
+        self.__result_cache.clear()
+
+        if appended_data is None:
+            self.__exclude_coordinate_columns()
+
+    @classmethod
+    def read_file(cls, file, progress_callback=None):
+        """
+        This function is used to parse specified file according to 'Global Climate Change' schema, that is:
+        place names are stored as 'category', measurements as 'float32', coordinates (i.e. '57.05N') as signed
+        'float32' and dates are parsed using a fixed format.
+
+        File is streamed in chunks of 'ingestion_chunk_size' rows, keeping peak memory within 'ingestion_memory_limit'
+        bytes (see 'TimeSeriesDatasetChunkedReader').
+        """
+        header = pandas.read_csv(file, nrows=0).columns
+
+        dtype = dict()
+        for column in header[1:]:
+            if column in cls.place_columns or column in cls.coordinate_columns:
+                dtype[column] = "category"
+            else:
+                dtype[column] = cls.measurement_dtype
+
+        reader = TimeSeriesDatasetChunkedReader(file,
+                                                dtype,
+                                                cls.date_format,
+                                                cls.ingestion_chunk_size,
+                                                cls.ingestion_memory_limit)
+        output = reader.read(progress_callback)
+
+        for column in cls.coordinate_columns:
+            if column in output.columns:
+                output[column] = cls.__convert_coordinates(output[column])
+
+        return output
+
+    @staticmethod
+    def __convert_coordinates(x):
+        """
+        This function is used to convert a categorical 'pandas.Series' of coordinates like '57.05N' or '10.33W' into
+        signed 'float32' values. Only categories are parsed, so the cost does not depend on the number of rows.
+        """
+        categories = x.cat.categories.astype(str)
+
+        values = numpy.array(categories.str[:-1], dtype=numpy.float32)
+        values[categories.str[-1].isin(["S", "W"])] *= -1
+
+        codes = x.cat.codes.to_numpy()
+        output = numpy.where(codes >= 0, values[codes], numpy.nan).astype(numpy.float32)
+
+        return pandas.Series(output, index=x.index, name=x.name)
+
+    def get_memory_usage(self):
+        """
+        This function is used to get the number of bytes used by data of current dataset, including its calendar
+        index.
+        """
+        output = super().get_memory_usage()
+
+        if self.__months is not None:
+            output += self.__months.nbytes + self.__years.nbytes
+
+        return output
+
+    def get_summary(self):
+        """
+        This function is used to get a summary of current dataset, including the number of 'State' and 'City'.
+        """
+        output = super().get_summary()
+
+        output["state_count"] = None if self.get_state_list() is None else len(self.get_state_list())
+        output["city_count"] = None if self.get_city_list() is None else len(self.get_city_list())
+
+        return output
+
     def get_state_list(self):
         """
         This function is used to get a list of all available 'State' inside current dataset.
         """
-        if self.__state_list is None:
-            self.__state_list = self._data["Country"].unique().tolist()
-
         return self.__state_list
 
     def get_city_list(self):
         """
         This function is used to get a list of all available 'City' inside current dataset.
         """
-        if self.__city_list is None:
-            self.__city_list = self._data["City"].unique().tolist()
-
         return self.__city_list
 
     def get_city_list_belonging_to_state(self, state_name):
         """
         This function is used to get a list of all available 'City' belonging to a specified 'State'.
         """
+        entry = self.__state_index.get(state_name)
 
-        if state_name == "" or state_name not in self.get_state_list():
-            return None
-
-        output = self.__state_to_city_map.get(state_name)
-        if output is None:
-            output = self._data[self._data["Country"] == state_name]["City"].unique().tolist()
-            self.__state_to_city_map[state_name] = output
-
-        return output
+        return None if entry is None else entry["cities"]
 
     def get_state_of_city(self, city_name):
         """
         This function is used to get the 'State' of a specified 'City' inside current dataset.
         """
+        return self.__city_to_state_map.get(city_name)
 
-        if city_name == "" or city_name not in self.get_city_list():
-            return None
+    def get_place_summary(self, state_name, city_name=""):
+        """
+        This function is used to get the number of rows and the time range of a specified 'State' or, if specified,
+        of a 'City' belonging to it. It returns 'None' if the place does not exist.
+        """
+        if city_name == "":
+            entry = self.__state_index.get(state_name)
+        else:
+            entry = self.__city_index.get((state_name, city_name))
 
-        output = self.__city_to_state_map.get(city_name)
-        if output is None:
-            output = self._data.query("City == {}".format("'{}'".format(city_name)))
-            output = output.iloc[0]["Country"]
-            self.__city_to_state_map[city_name] = output
+        if entry is None:
+            return None
 
-        return output
+        return {"row_count": entry["row_count"], "time_range": list(entry["time_range"])}
 
     def get_filtered_data(self, month, use_month_filter, city, state, time_range, active_columns):
         """
         This function is used to filter available data according to user specified options.
         This function does not alter original data!
 
-        It returns a 'pandas.DataFrame' object.
+        Options are converted into a 'TimeSeriesDatasetQuery' object, which validates them, then executed. It returns a
+        'pandas.DataFrame' object, whose columns are read-only. Results of recent queries are cached.
+        """
+        place = self.__build_place(city, state)
+        query = self.__build_query(month, use_month_filter, [] if place is None else [place], time_range,
+                                   active_columns)
+
+        return query.execute()["" if place is None else place]
+
+    def get_grouped_filtered_data(self, month, use_month_filter, places, time_range, active_columns):
+        """
+        This function is used to filter available data of several places at once, using the same options for all of
+        them. Every place is a 'State' name or a ('State', 'City') pair.
+
+        It returns a 'dict' object mapping each place to the 'pandas.DataFrame' object which 'get_filtered_data'
+        would return for it. Options are validated once, for all places; errors are raised following the order of
+        places.
+        """
+        if not isinstance(places, list):
+            raise TypeError("[ERROR]: 'places' must 'list' type object! ({})".format(type(places)))
+
+        query = self.__build_query(month, use_month_filter, list(dict.fromkeys(places)), time_range, active_columns)
+
+        return query.execute()
+
+    def __build_place(self, city, state):
+        """
+        This function is used to convert 'State' and 'City' filters into a place of a 'TimeSeriesDatasetQuery'
+        object; it returns 'None' for datasets without 'State' field.
+        """
+        if self.get_city_list() is not None:
+            return state, city
+        if self.get_state_list() is not None:
+            return state
+
+        return None
+
+    def __build_query(self, month, use_month_filter, places, time_range, active_columns):
+        """
+        This function is used to build the 'TimeSeriesDatasetQuery' object described by 'get_filtered_data' options.
+        """
+        # Imported here, because 'TimeSeriesDatasetQuery' module depends on this one...
+        from src.TimeSeriesDataset.TimeSeriesDatasetQuery import TimeSeriesDatasetQuery
+
+        return TimeSeriesDatasetQuery(self, places, [month] if use_month_filter else None, time_range, active_columns)
+
+    def get_result_cache_statistics(self):
+        """
+        This function is used to get hit/miss statistics of the cache of 'get_filtered_data' results.
+        """
+        return self.__result_cache.get_statistics()
+
+    def execute_query(self, query):
+        """
+        This function is used to execute specified 'TimeSeriesDatasetQuery' object, running the stages of each one of
+        its places in the order chosen by its plan.
+
+        It returns a 'dict' object mapping each place ("" for datasets without places) to its records, as a
+        'pandas.DataFrame' object whose columns are read-only. Results are cached, using single-place queries as keys.
+
+        On whole dataset data, records of all places missing from the cache are selected together, in a single pass
+        (see '__select_grouped_records'); only gap filling is run one place at a time.
+        """
+        if query.get_dataset() is not self:
+            raise ValueError("[ERROR]: Specified query does NOT belong to dataset '{}'!".format(self.get_name()))
+
+        output = dict()
+        place_queries = dict()
+
+        for place in query.get_places() or [""]:
+            place_queries[place] = query.with_places([place]) if place != "" else query
+            output[place] = self.__result_cache.get(place_queries[place])
+
+        missing_places = [x for x in place_queries.keys() if output[x] is None]
+
+        selections = dict()
+        if self._partitions is None and len(missing_places) > 1:
+            selections = self.__select_grouped_records(query, missing_places)
+
+        for place in missing_places:
+            stages = [x["stage"] for x in place_queries[place].get_plan()]
+            if place in selections:
+                stages = [x for x in stages if x in ["gap_filling", "year_range_filter"]]
+
+            output[place] = self.__result_cache.put(place_queries[place], self.__run_query_stages(
+                place_queries[place], stages, selections.get(place)))
+
+        return output
+
+    def __select_grouped_records(self, query, places):
         """
-        if not isinstance(month, str):
-            raise TypeError("[ERROR]: 'month' must 'str' type object! ({})".format(type(month)))
-        if not isinstance(use_month_filter, bool):
-            raise TypeError("[ERROR]: 'use_month_filter' must 'bool' type object! ({})".format(type(use_month_filter)))
-        if not isinstance(city, str):
-            raise TypeError("[ERROR]: 'city' must 'str' type object! ({})".format(type(city)))
-        if not isinstance(state, str):
-            raise TypeError("[ERROR]: 'state' must 'str' type object! ({})".format(type(state)))
-        if not isinstance(time_range, list):
-            raise TypeError("[ERROR]: 'time_range' must 'list' type object! ({})".format(type(time_range)))
-        if not isinstance(active_columns, list):
-            raise TypeError("[ERROR]: 'active_columns' must 'list' type object! ({})".format(type(active_columns)))
+        This function is used to run 'place_selection', 'month_filter' and 'year_range_selection' stages of specified
+        query for several places of whole dataset data at once.
 
-        output = self._data
+        Rows of all places are concatenated, 'Month' filter is applied by a single mask and every column is gathered
+        once; the rows kept around the 'year range' of each place are then found on the gathered arrays. It returns a
+        'dict' object mapping each place to its selected records, together with their years and months.
+        """
+        columns = query.get_columns()
+        month_indexes = query.get_month_indexes()
+        year_range = query.get_year_range()
+
+        rows = numpy.arange(len(self._data))
+        place_positions = [rows[self.__get_place_rows(*reversed(query.get_place_filter(x)))] for x in places]
+
+        positions = numpy.concatenate(place_positions)
+        place_ids = numpy.repeat(numpy.arange(len(places)), [len(x) for x in place_positions])
 
         # MONTH FILTER...
         # ========================================= #
-        if use_month_filter:
+        if month_indexes is not None:
+            is_selected = numpy.isin(self.__months[positions], month_indexes)
+            positions = positions[is_selected]
+            place_ids = place_ids[is_selected]
 
-            if month == "":
-                raise ValueError("[ERROR]: MONTH empty!")
+        bounds = numpy.searchsorted(place_ids, numpy.arange(len(places) + 1), side="left")
 
-            elif month in TimeSeriesDatasetGlobalClimateChange.month_calendar_map.keys():
-                output = output[output.index.month == TimeSeriesDatasetGlobalClimateChange.month_calendar_map[month]]
+        # GATHER...
+        # ========================================= #
+        years = self.__years[positions]
+        months = self.__months[positions]
+        values = [self._data[x].to_numpy()[positions] for x in columns]
+        data = pandas.DataFrame(dict(zip(columns, values)), index=self._data.index[positions], columns=columns,
+                                copy=False)
 
+        # YEAR RANGE SELECTION...
+        # ========================================= #
+        output = dict()
+        for k, place in enumerate(places):
+            start, stop = int(bounds[k]), int(bounds[k + 1])
+
+            if query.get_gap_policy() == "interpolate":
+                first, last = TimeSeriesDatasetGlobalClimateChange.__find_time_range_rows(
+                    [x[start:stop] for x in values], years[start:stop], months[start:stop], None, year_range)
             else:
-                raise ValueError("[ERROR]: Specified MONTH name does NOT exist!")
+                first = int(numpy.searchsorted(years[start:stop], year_range[0], side="left"))
+                last = int(numpy.searchsorted(years[start:stop], year_range[1], side="right"))
 
-        # STATE FILTER...
-        # ========================================= #
-        if self.get_state_list() is not None:
+            output[place] = (data.iloc[start + first:start + last],
+                             years[start + first:start + last],
+                             months[start + first:start + last])
 
-            if state == "":
-                raise ValueError("[ERROR]: 'STATE' field empty!")
+        return output
 
-            elif state in self.get_state_list():
-                output = output[output["Country"] == state]
+    def __run_query_stages(self, query, stages, selection=None):
+        """
+        This function is used to run specified stages of a (single-place) query. Until 'gap_filling' stage, the year
+        and the month of each selected record are carried along with records. If specified, 'selection' holds the
+        records (with their years and months) already selected by previous stages.
+        """
+        state, city = ("", "") if len(query.get_places()) == 0 else query.get_place_filter(query.get_places()[0])
+        columns = query.get_columns()
+        month_indexes = query.get_month_indexes()
+        year_range = query.get_year_range()
+
+        output, years, months = (None, None, None) if selection is None else selection
+        is_filled = None
+
+        for stage in stages:
+
+            if stage == "place_selection":
+                if self._partitions is None:
+                    rows = self.__get_place_rows(city, state)
+                    output = self._data[columns].iloc[rows]
+                    years = self.__years[rows]
+                    months = self.__months[rows]
+                else:
+                    output = self.__select_partitioned_records(city, state, columns, month_indexes, year_range,
+                                                               query.get_gap_policy() == "interpolate")
+                    years = output.index.year.to_numpy()
+                    months = output.index.month.to_numpy()
+
+            elif stage == "month_filter":
+                is_selected = numpy.isin(months, month_indexes)
+                output = output[is_selected]
+                years = years[is_selected]
+                months = months[is_selected]
+
+                # Every remaining record belongs to selected months...
+                month_indexes = None
+
+            elif stage == "year_range_selection":
+                if query.get_gap_policy() == "interpolate":
+                    first, last = TimeSeriesDatasetGlobalClimateChange.__find_time_range_rows(
+                        [output[x].to_numpy() for x in output.columns], years, months, month_indexes, year_range)
+                else:
+                    first = int(numpy.searchsorted(years, year_range[0], side="left"))
+                    last = int(numpy.searchsorted(years, year_range[1], side="right"))
+
+                output = output.iloc[first:last]
+                years = years[first:last]
+                months = months[first:last]
+
+            elif stage == "gap_filling":
+                if len(output) == 0:
+                    raise ValueError("[ERROR]: No Data!")
+                if not output.index.is_unique:
+                    raise ValueError("[ERROR]: Records of specified place have duplicated 'Time' values!")
+
+                output, is_filled = TimeSeriesDatasetGlobalClimateChange.__fill_gaps(output)
+
+            elif stage == "year_range_filter":
+                is_selected = TimeSeriesDatasetGlobalClimateChange.__select_time_range(output, year_range)
+                output = output.iloc[is_selected]
+                is_filled = is_filled[is_selected]
 
             else:
-                raise ValueError("[ERROR]: Specified 'STATE' does NOT exist!")
+                raise ValueError("[ERROR]: Unknown query stage '{}'!".format(stage))
 
-        # CITY FILTER...
-        # ========================================= #
+        if len(output) == 0:
+            raise ValueError("[ERROR]: No Data!")
+
+        output.attrs["filled_rows"] = 0 if is_filled is None else int(is_filled.sum())
+
+        return output
+
+    @staticmethod
+    def __select_time_range(data, time_range):
+        """
+        This function is used to select the records of specified data inside specified time range. When data are
+        sorted by 'Time', these records are contiguous and a 'slice' object is returned, so that they can be taken
+        as a view, without copying them; otherwise a boolean array is returned.
+        """
+        years = data.index.year.to_numpy()
+
+        if data.index.is_monotonic_increasing:
+            return slice(int(numpy.searchsorted(years, time_range[0], side="left")),
+                         int(numpy.searchsorted(years, time_range[1], side="right")))
+
+        return numpy.logical_and(years >= time_range[0], years <= time_range[1])
+
+    @staticmethod
+    def __fill_gaps(data):
+        """
+        This function is used to fill missing records of specified data (sorted by 'Time', one record per month)
+        working on its arrays, in a single pass over each column: missing months are inserted, missing values are
+        linearly interpolated and leading records which cannot be interpolated are dropped. Results are the same
+        obtained using 'reindex', 'interpolate' and 'dropna'. Columns having nothing to fill are not copied.
+
+        It returns filled data and a boolean array telling which of its records have been filled.
+        """
+        months = data.index.year.to_numpy() * 12 + data.index.month.to_numpy()
+        positions = months - months[0]
+        number_of_records = int(positions[-1]) + 1
+
+        is_filled = numpy.ones(number_of_records, dtype=bool)
+        is_filled[positions] = False
+
+        first_position = 0
+        columns = dict()
+
+        for column in data.columns:
+            original_values = data[column].to_numpy()
+
+            if number_of_records == len(data) and pandas.notna(original_values).all():
+                columns[column] = original_values
+                continue
+
+            values = numpy.full(number_of_records, numpy.nan)
+            values[positions] = data[column].to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+
+            is_missing = numpy.isnan(values)
+            valid_positions = numpy.flatnonzero(~is_missing)
+
+            if len(valid_positions) == 0:
+                first_position = number_of_records
+            else:
+                # Values after the last valid one are set to it, like 'interpolate' does...
+                values[is_missing] = numpy.interp(numpy.flatnonzero(is_missing), valid_positions,
+                                                  values[valid_positions])
+                first_position = max(first_position, int(valid_positions[0]))
+
+            is_filled |= is_missing
+            columns[column] = values.astype(data[column].dtype, copy=False)
+
+        if number_of_records == len(data):
+            index = data.index
+        else:
+            # Built from month numbers, since 'date_range' is slow when called for many places...
+            index = pandas.DatetimeIndex((months[0] - 1970 * 12 - 1 + numpy.arange(number_of_records)).astype(
+                "datetime64[M]").astype(data.index.dtype), freq="MS")
+
+        output = pandas.DataFrame(columns, index=index, columns=data.columns, copy=False)
+
+        return output.iloc[first_position:], is_filled[first_position:]
+
+    @staticmethod
+    def __find_time_range_rows(columns, years, months, month_indexes, time_range):
+        """
+        This function is used to find the rows of specified data (sorted by 'Time' and given as a list of column
+        arrays) inside specified time range together with, for each column, the nearest rows having a valid value
+        before and after it (or, if there is no valid value after it, the nearest row after it). If 'month_indexes' is
+        not 'None', only rows of those months (according to 'months' array) are considered as nearest rows.
+
+        Nearest rows are searched in blocks of growing size, so only rows close to the time range are usually read.
+        It returns the first position and the last (excluded) position of found rows.
+        """
+        lower = int(numpy.searchsorted(years, time_range[0], side="left"))
+        upper = int(numpy.searchsorted(years, time_range[1], side="right"))
+
+        first = lower
+        last = upper
+        for values in columns:
+
+            # Before the time range...
+            size = 16
+            stop = lower
+            while stop > 0:
+                start = max(stop - size, 0)
+                found = TimeSeriesDatasetGlobalClimateChange.__find_usable_rows(values, months, month_indexes, start,
+                                                                                stop)
+                if len(found) != 0:
+                    first = min(first, start + int(found[-1]))
+                    break
+
+                stop = start
+                size *= 4
+
+            # After the time range...
+            size = 16
+            start = upper
+            while start < len(values):
+                stop = min(start + size, len(values))
+                found = TimeSeriesDatasetGlobalClimateChange.__find_usable_rows(values, months, month_indexes, start,
+                                                                                stop)
+                if len(found) != 0:
+                    last = max(last, start + int(found[0]) + 1)
+                    break
+
+                start = stop
+                size *= 4
+            else:
+                # No valid value after the time range: 'interpolate' sets values up to the last record to the last
+                # valid one, so the nearest record after the time range (of selected months) is kept anyway...
+                following = numpy.arange(upper, len(values)) if month_indexes is None \
+                    else upper + numpy.flatnonzero(numpy.isin(months[upper:], month_indexes))
+                if len(following) != 0:
+                    last = max(last, int(following[0]) + 1)
+
+        return first, last
+
+    @staticmethod
+    def __find_usable_rows(values, months, month_indexes, start, stop):
+        """
+        This function is used to get the positions, relative to 'start', of rows between 'start' and 'stop' having a
+        valid value and, if 'month_indexes' is not 'None', belonging to one of those months.
+        """
+        is_usable = pandas.notna(values[start:stop])
+        if month_indexes is not None:
+            is_usable &= numpy.isin(months[start:stop], month_indexes)
+
+        return numpy.flatnonzero(is_usable)
+
+    def __get_place_rows(self, city, state):
+        """
+        This function is used to get the slice of rows of whole dataset data selected by (validated) 'State' and
+        'City' filters.
+        """
         if self.get_city_list() is not None:
+            return self.__city_index.get((state, city), {"rows": slice(0, 0)})["rows"]
+        if self.get_state_list() is not None:
+            return self.__state_index[state]["rows"]
+
+        return slice(None)
+
+    def __select_partitioned_records(self, city, state, columns, month_indexes, year_range, is_widened):
+        """
+        This function is used to select records of specified place reading only partitions needed by specified
+        'year range'. Records are not filtered by month.
+
+        When data are partitioned by decade and 'is_widened' is 'True', the decades overlapping the year range are
+        widened until every column has a valid value of selected months at (or beyond) both edges of the range, or
+        until there is nothing left to read. In this way, interpolation at the edges gives the same results obtained
+        using the whole dataset.
+        """
+        decades = self._partitions.get_decades(state)
+
+        lower = 0 if decades is None else len([x for x in decades if x + 9 < year_range[0]])
+        upper = 0 if decades is None else len([x for x in decades if x <= year_range[1]])
 
-            if city == "":
-                raise ValueError("ERROR: 'CITY' field empty!")
+        start = pandas.Timestamp(year=year_range[0], month=1, day=1)
+        end = pandas.Timestamp(year=year_range[1], month=12, day=1)
 
-            elif city in self.get_city_list():
+        while True:
+            output = self._get_partitioned_data([state], None if decades is None else decades[lower:upper])
+            if city != "":
                 output = output[output["City"] == city]
+            output = output[columns]
 
-            else:
-                raise ValueError("[ERROR]: Specified 'CITY' does NOT exist!")
+            if decades is None or not is_widened:
+                return output
+
+            usable = output
+            if month_indexes is not None:
+                usable = output[numpy.isin(output.index.month, month_indexes)]
+
+            first_valid = [usable[x].first_valid_index() for x in usable.columns]
+            last_valid = [usable[x].last_valid_index() for x in usable.columns]
 
-        # COLUMN FILTER...
+            widen_lower = lower > 0 and any(x is None or x > start for x in first_valid)
+            widen_upper = upper < len(decades) and any(x is None or x < end for x in last_valid)
+
+            if not widen_lower and not widen_upper:
+                return output
+
+            lower = lower - 1 if widen_lower else lower
+            upper = upper + 1 if widen_upper else upper
+
+    def get_grouped_regression_table(self, group_column, month, use_month_filter, time_range, column):
+        """
+        This function is used to fit a regression line of specified column over 'Time' for every 'State' (if
+        'group_column' is "Country", for datasets without 'City' field) or for every 'City' (if it is "City") of
+        current dataset at once. Every line is fitted on the same records 'get_filtered_data' returns for its place,
+        so missing records are inserted and interpolated; places having no data are skipped.
+
+        Records of all groups are completed together, working on whole arrays: for every group, the months between
+        the first valid value and the last record of the rows 'get_filtered_data' keeps around the time range are
+        generated, then their values are interpolated by a single 'numpy.interp' call. Sufficient statistics of all
+        groups are computed by a few grouped reductions ('numpy.bincount'), so no 'UnivariateRegressionLine' object is
+        built. It returns a 'pandas.DataFrame' object holding, for every group having at least 2 records, its 'State'
+        (and 'City'), 'Size', 'Slope', 'Intercept' and 'R^2'.
+        """
+        if group_column not in ["Country", "City"]:
+            raise ValueError("[ERROR]: 'group_column' must be \"Country\" or \"City\"!")
+        if (group_column == "Country" and self.get_state_list() is None) or \
+                (group_column == "City" and self.get_city_list() is None):
+            raise ValueError("[ERROR]: Dataset '{}' has no '{}' field!".format(self.get_name(), group_column))
+        if group_column == "Country" and self.get_city_list() is not None:
+            # Like 'get_filtered_data', a 'State' of a dataset having 'City' field is not a single series...
+            raise ValueError("[ERROR]: Records of dataset '{}' must be grouped by \"City\"!".format(self.get_name()))
+
+        place_columns = ["State", "City"] if group_column == "City" else ["State"]
+        places = list(self.__city_index.keys()) if group_column == "City" else list(self.__state_index.keys())
+
+        # Options are validated as 'get_filtered_data' does...
+        query = self.__build_query(month, use_month_filter, places, time_range, [column])
+        month_indexes = query.get_month_indexes()
+        year_range = query.get_year_range()
+
+        # GROUP OF EACH RECORD...
         # ========================================= #
-        if len(active_columns) != 0:
-            output = output[active_columns]
+        if self._partitions is None:
+            # Groups are contiguous ranges of rows, taken from the place index...
+            data = self._data
+            years = self.__years
+            months = self.__months
+
+            place_index = self.__city_index if group_column == "City" else self.__state_index
+
+            group_ids = numpy.full(len(data), -1, dtype=numpy.int64)
+            for k, entry in enumerate(place_index.values()):
+                group_ids[entry["rows"]] = k
         else:
-            raise ValueError("[ERROR]: No 'COLUMN' selected!")
+            data = self.get_data()
+            years = data.index.year.to_numpy()
+            months = data.index.month.to_numpy()
+
+            if group_column == "City":
+                place_keys = pandas.MultiIndex.from_arrays([data["Country"], data["City"]])
+                group_ids = pandas.MultiIndex.from_tuples(places).get_indexer(place_keys)
+            else:
+                group_ids = pandas.Index(places).get_indexer(data["Country"])
 
-        # REINDEXING IN ORDER TO FIND MISSING RECORDS...
+        # RECORD SELECTION...
         # ========================================= #
-        new_index = pandas.date_range(start=output.index.min(),
-                                      end=output.index.max(),
-                                      freq="MS") # 'MS' stands for "month start frequency"
+        is_selected = group_ids >= 0
+        if month_indexes is not None:
+            is_selected &= numpy.isin(months, month_indexes)
+
+        values = data[column].to_numpy()
 
-        expected_number_of_records = len(new_index)
-        provided_number_of_records = len(output.index)
+        group_ids = group_ids[is_selected]
+        month_numbers = years[is_selected].astype(numpy.int64) * 12 + months[is_selected] - 1
+        observations = values[is_selected].astype(numpy.float64)
 
-        if provided_number_of_records != expected_number_of_records:
-            # Uncomment if you want...
-            # print("Detected {} missing records! Reindexing...".format(expected_number_of_records - provided_number_of_records))
-            output = output.reindex(new_index)
+        # Rows are sorted by group and 'Time' (keeping the order of duplicated ones), unless they already are...
+        group_span = 12 * (int(max(numpy.max(years, initial=0), year_range[1])) + 2)
+        keys = group_ids * group_span + month_numbers
 
-        # MANAGE 'NaN' VALUES...
+        if numpy.any(keys[1:] < keys[:-1]):
+            order = numpy.argsort(keys, kind="stable")
+            keys = keys[order]
+            group_ids = group_ids[order]
+            month_numbers = month_numbers[order]
+            observations = observations[order]
+
+        # ROWS KEPT AROUND THE TIME RANGE...
         # ========================================= #
-        number_of_nan_values = output.isnull().sum().sum()
+        # Like '__find_time_range_rows' does for each place, rows inside the time range are kept together with the
+        # nearest rows having a valid value before and after it (or, if there is none after it, the nearest row)...
+        number_of_groups = len(places)
+        groups = numpy.arange(number_of_groups)
 
-        if number_of_nan_values == len(output):
-            raise ValueError("[ERROR]: No Data!")
+        lower = numpy.searchsorted(keys, groups * group_span + year_range[0] * 12, side="left")
+        upper = numpy.searchsorted(keys, groups * group_span + year_range[1] * 12 + 12, side="left")
+        group_stops = numpy.searchsorted(keys, (groups + 1) * group_span, side="left")
+
+        # Positions of valid values end with a sentinel, belonging to no group...
+        valid_positions = numpy.append(numpy.flatnonzero(~numpy.isnan(observations)), len(observations))
+        valid_group_ids = numpy.append(group_ids, -1)[valid_positions]
 
-        if number_of_nan_values > 0:
-            # Uncomment if you want...
-            # print("Detected {} 'NaN' values. They will be managed with 'interpolate'...".format(number_of_nan_values))
+        before = numpy.searchsorted(valid_positions, lower, side="left") - 1
+        has_before = valid_group_ids[before] == groups
+        first_kept = numpy.where(has_before, valid_positions[before], lower)
 
-            output = output.interpolate()
+        after = numpy.searchsorted(valid_positions, upper, side="left")
+        has_after = valid_group_ids[after] == groups
+        last_kept = numpy.where(has_after, valid_positions[after] + 1, numpy.minimum(upper + 1, group_stops))
 
-            if output.isnull().sum().sum() > 0:
-                # Some 'NaN' can remain a the 'edge' of the dataset. Use 'dropna'
-                output = output.dropna()
+        # Like 'get_filtered_data', groups having duplicated 'Time' values among kept rows are skipped...
+        duplicated = numpy.flatnonzero((group_ids[1:] == group_ids[:-1]) & (month_numbers[1:] == month_numbers[:-1]))
+        duplicated = duplicated[(first_kept[group_ids[duplicated]] <= duplicated) &
+                                (duplicated + 1 < last_kept[group_ids[duplicated]])]
 
-        # TIME RANGE FILTER...
+        is_skipped = numpy.zeros(number_of_groups, dtype=bool)
+        is_skipped[group_ids[duplicated]] = True
+
+        # GAP FILLING...
         # ========================================= #
-        if len(time_range) == 2:
-            output = output[
-                numpy.logical_and(output.index.year >= time_range[0], output.index.year <= time_range[1])]
-        else:
-            raise ValueError("[ERROR]: Specified 'TIME RANGE' is INVALID!")
+        # Months of each group, from the first valid value of its kept rows to its last kept row, inside the time
+        # range, are generated...
+        first_valid = numpy.searchsorted(valid_positions, first_kept, side="left")
+        has_valid = (valid_group_ids[first_valid] == groups) & ~is_skipped
+
+        padded_month_numbers = numpy.append(month_numbers, 0)
+        starts = numpy.maximum(padded_month_numbers[valid_positions[first_valid]], year_range[0] * 12)
+        stops = numpy.minimum(padded_month_numbers[last_kept - 1], year_range[1] * 12 + 11)
+        size = numpy.where(has_valid, numpy.maximum(stops - starts + 1, 0), 0)
+
+        valid_positions = valid_positions[:-1]
+        valid_group_ids = valid_group_ids[:-1]
+        valid_month_numbers = month_numbers[valid_positions]
+        valid_observations = observations[valid_positions]
+
+        is_last_valid = numpy.diff(valid_group_ids, append=-1) != 0
+        last_valid_records = numpy.zeros(number_of_groups, dtype=numpy.int64)
+        last_valid_records[valid_group_ids[is_last_valid]] = valid_month_numbers[is_last_valid]
+        last_valid_observations = numpy.zeros(number_of_groups)
+        last_valid_observations[valid_group_ids[is_last_valid]] = valid_observations[is_last_valid]
+
+        group_ids = numpy.repeat(groups, size)
+        month_numbers = numpy.arange(len(group_ids)) - numpy.repeat(numpy.cumsum(size) - size, size) + starts[group_ids]
+
+        # Keys of different groups are far apart, so that values are interpolated inside groups only...
+        observations_y = numpy.zeros(len(group_ids))
+        if len(group_ids) != 0:
+            observations_y = numpy.interp(group_ids * group_span + month_numbers,
+                                          valid_group_ids * group_span + valid_month_numbers, valid_observations)
+
+        # Values after the last valid one are set to it, like 'interpolate' does...
+        is_after_last_valid = month_numbers > last_valid_records[group_ids]
+        observations_y[is_after_last_valid] = last_valid_observations[group_ids[is_after_last_valid]]
+
+        # Filled values are stored using column 'dtype', as 'get_filtered_data' does...
+        observations_y = observations_y.astype(values.dtype).astype(numpy.float64)
+        observations_x = (month_numbers - 1970 * 12).astype("datetime64[M]").astype("datetime64[s]") \
+            .astype(numpy.int64).astype(numpy.float64)
+
+        # GROUPED SUFFICIENT STATISTICS...
+        # ========================================= #
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            mean_x = numpy.bincount(group_ids, observations_x, number_of_groups) / size
+            mean_y = numpy.bincount(group_ids, observations_y, number_of_groups) / size
 
-        if len(output) == 0:
-            raise ValueError("[ERROR]: No Data!")
+            deviations_x = observations_x - mean_x[group_ids]
+            deviations_y = observations_y - mean_y[group_ids]
 
-        return output
+            sum_of_squares_x = numpy.bincount(group_ids, deviations_x * deviations_x, number_of_groups)
+            sum_of_squares_y = numpy.bincount(group_ids, deviations_y * deviations_y, number_of_groups)
+            co_moment = numpy.bincount(group_ids, deviations_x * deviations_y, number_of_groups)
+
+            slope = co_moment / sum_of_squares_x
+            intercept = mean_y - slope * mean_x
+            coefficient_of_determination = slope * co_moment / sum_of_squares_y
+
+        # OUTPUT...
+        # ========================================= #
+        is_fitted = size >= 2
+
+        output = pandas.DataFrame([x if group_column == "City" else (x,) for x, y in zip(places, is_fitted) if y],
+                                  columns=place_columns)
+        output["Size"] = size[is_fitted]
+        output["Slope"] = slope[is_fitted]
+        output["Intercept"] = intercept[is_fitted]
+        output["R^2"] = coefficient_of_determination[is_fitted]
+
+        return output.sort_values(place_columns, ignore_index=True)
 
     @staticmethod
     def compute_univariate_regression_line(data, name=""):
@@ -199,8 +902,8 @@ class TimeSeriesDatasetGlobalClimateChange(TimeSeriesDataset):
             raise ValueError(
                 "[ERROR]: Too many 'COLUMN' selected! Please select only one or disable regression line checkbox!")
 
-        observations_x = TimeSeriesDatasetGlobalClimateChange.__convert_datetime_index_to_int_list(data.index)
-        observations_y = data.values.reshape(data.values.shape[0]).tolist()
+        observations_x = TimeSeriesDatasetGlobalClimateChange.__convert_datetime_index_to_seconds(data.index)
+        observations_y = data.iloc[:, 0].to_numpy(dtype=numpy.float64)
 
         sample_x = SimpleRandomSample(observations_x)
         sample_y = SimpleRandomSample(observations_y)
@@ -208,16 +911,32 @@ class TimeSeriesDatasetGlobalClimateChange(TimeSeriesDataset):
         return UnivariateRegressionLine(name, sample_x, sample_y)
 
     @staticmethod
-    def __convert_datetime_index_to_int_list(x):
+    def compute_univariate_regression_lines(data_by_name, executor=None):
         """
-        This function is used to convert a 'pandas.core.indexes.datetimes.DatetimeIndex' type object into a 'list' object.
+        This function is used to create a regression line for each one of specified data. Lines are fitted one after
+        another or, if a 'concurrent.futures' executor is specified (i.e. a 'ProcessPoolExecutor' object), in parallel
+        on it: fitting a line is fast, so a pool pays off only for many large data. 'data_by_name' maps names to data;
+        lines are returned following its order.
         """
-        output = list()
+        if not isinstance(data_by_name, dict):
+            raise TypeError("[ERROR]: 'data_by_name' must 'dict' type object! ({})".format(type(data_by_name)))
 
-        for k in range(0, len(x)):
-            output.append(x[k].timestamp())
+        if executor is None:
+            return [TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_line(data, name)
+                    for name, data in data_by_name.items()]
 
-        return output
+        futures = [executor.submit(TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_line, data, name)
+                   for name, data in data_by_name.items()]
+
+        return [x.result() for x in futures]
+
+    @staticmethod
+    def __convert_datetime_index_to_seconds(x):
+        """
+        This function is used to convert a 'pandas.core.indexes.datetimes.DatetimeIndex' type object into a 'float64'
+        array of POSIX timestamps (seconds), as 'pandas.Timestamp.timestamp' does.
+        """
+        return ((x - pandas.Timestamp(0)) / pandas.Timedelta(seconds=1)).to_numpy(dtype=numpy.float64)
 
 
 class TimeSeriesDatasetGlobalClimateChangeNoCity(TimeSeriesDatasetGlobalClimateChange):
@@ -226,8 +945,10 @@ class TimeSeriesDatasetGlobalClimateChangeNoCity(TimeSeriesDatasetGlobalClimateC
     Data do not have 'City' field.
     """
 
-    def __init__(self, name, file):
-        super().__init__(name, file)
+    catalog_column = None
+
+    def __init__(self, name, file, use_cache=True, use_memory_map=False, partitioning=None):
+        super().__init__(name, file, use_cache, use_memory_map, partitioning)
 
     def get_city_list(self):
         return None
@@ -245,8 +966,11 @@ class TimeSeriesDatasetGlobalClimateChangeNoStateNoCity(TimeSeriesDatasetGlobalC
     Data do not have 'City' and 'State' (called 'Country' inside CSV files)  fields.
     """
 
-    def __init__(self, name, file):
-        super().__init__(name, file)
+    partition_column = None
+    catalog_column = None
+
+    def __init__(self, name, file, use_cache=True, use_memory_map=False, partitioning=None):
+        super().__init__(name, file, use_cache, use_memory_map, partitioning)
 
     def get_state_list(self):
         return None
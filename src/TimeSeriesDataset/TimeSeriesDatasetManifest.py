@@ -0,0 +1,72 @@
+import json
+import os
+
+from src.TimeSeriesDataset.TimeSeriesDatasetCache import TimeSeriesDatasetCache
+
+
+class TimeSeriesDatasetManifest(object):
+    """
+    This class is used to manage the manifest of a directory containing 'Time Series' dataset files.
+
+    For each file, the manifest stores a summary of its content, that is its 'TimeSeriesDataset' class, its columns,
+    numeric columns, time range and number of 'State' and 'City', together with the file's fingerprint.
+    Summaries are used only while the fingerprint of the file does not change.
+    """
+
+    manifest_file_name = ".manifest.json"
+    format_version = 1
+
+    def __init__(self, directory):
+
+        if not isinstance(directory, str):
+            raise TypeError("[ERROR]: 'directory' must be 'str' type.")
+
+        self.__directory = directory
+        self.__path = os.path.join(directory, TimeSeriesDatasetManifest.manifest_file_name)
+        self.__entries = self.__read()
+
+    def get(self, file):
+        """
+        This function is used to get the summary of specified file. It returns 'None' if it is missing or stale.
+        """
+        entry = self.__entries.get(os.path.basename(file))
+
+        if entry is None or entry["fingerprint"] != TimeSeriesDatasetCache(file).get_file_fingerprint():
+            return None
+
+        return entry
+
+    def update(self, file, summary):
+        """
+        This function is used to store the summary of specified file, computing its current fingerprint.
+        Manifest is saved immediately.
+        """
+        if not isinstance(summary, dict):
+            raise TypeError("[ERROR]: 'summary' must be 'dict' type.")
+
+        entry = dict(summary)
+        entry["fingerprint"] = TimeSeriesDatasetCache(file).get_file_fingerprint()
+
+        self.__entries[os.path.basename(file)] = entry
+        self.__save()
+
+    def __read(self):
+        try:
+            with open(self.__path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+        if manifest.get("format_version") != TimeSeriesDatasetManifest.format_version:
+            return dict()
+
+        return manifest["entries"]
+
+    def __save(self):
+        temporary_path = self.__path + ".tmp"
+        try:
+            with open(temporary_path, "w") as file:
+                json.dump({"format_version": TimeSeriesDatasetManifest.format_version, "entries": self.__entries}, file)
+            os.replace(temporary_path, self.__path)
+        except OSError as error:
+            print("[WARNING]: Unable to write manifest of '{}'! ({})".format(self.__directory, error))
@@ -0,0 +1,281 @@
+import json
+import os
+import shutil
+
+from src import Common
+from src.TimeSeriesDataset.TimeSeriesDatasetCache import TimeSeriesDatasetCache
+
+numpy = Common.lazy_import("numpy")
+pandas = Common.lazy_import("pandas")
+
+
+class TimeSeriesDatasetPartitionedStore(object):
+    """
+    This class is used to manage a 'partitioned' copy of a 'Time Series' dataset file, built once from it.
+
+    Data are split according to the values of a 'partition column' (i.e. 'Country') and, optionally, by decade.
+    Every partition is stored as a 'columnar' cache (see 'TimeSeriesDatasetCache'), so that a query reads only the
+    partitions it needs. The store also keeps a small 'catalog', that is the list of partition keys, the values of an
+    optional 'catalog column' (i.e. 'City') found inside each partition, the number of rows and the time range of
+    every key and catalog value, the time range and the numeric columns, so that no partition has to be read to
+    answer these questions.
+    """
+
+    manifest_file_name = "manifest.json"
+    format_version = 4
+
+    def __init__(self, file, partition_column, catalog_column=None, partition_by_decade=False, directory=None):
+
+        if not isinstance(file, str):
+            raise TypeError("[ERROR]: 'file' must be 'str' type.")
+        if not isinstance(partition_column, str):
+            raise TypeError("[ERROR]: 'partition_column' must be 'str' type.")
+
+        if directory is None:
+            parent_directory, file_name = os.path.split(file)
+            directory = os.path.join(parent_directory, ".partitions", file_name)
+
+        self.__file = file
+        self.__directory = directory
+        self.__partition_column = partition_column
+        self.__catalog_column = catalog_column
+        self.__partition_by_decade = partition_by_decade
+        self.__manifest = None
+
+    def is_valid(self):
+        """
+        This function is used to check if the store exists and it is still consistent with the source file.
+        """
+        manifest = self.__read_manifest()
+        return manifest is not None \
+            and manifest["format_version"] == TimeSeriesDatasetPartitionedStore.format_version \
+            and manifest["partition_column"] == self.__partition_column \
+            and manifest["catalog_column"] == self.__catalog_column \
+            and manifest["partition_by_decade"] == self.__partition_by_decade \
+            and manifest["fingerprint"] == TimeSeriesDatasetCache(self.__file).get_file_fingerprint()
+
+    def build(self, data):
+        """
+        This function is used to (re)build the store from specified 'pandas.DataFrame' object.
+        """
+        if not isinstance(data, pandas.DataFrame):
+            raise TypeError("[ERROR]: 'data' must be 'pandas.DataFrame' type.")
+        if self.__partition_column not in data.columns:
+            raise ValueError("[ERROR]: Column '{}' does NOT exist!".format(self.__partition_column))
+
+        fingerprint = TimeSeriesDatasetCache(self.__file).get_file_fingerprint()
+
+        shutil.rmtree(self.__directory, ignore_errors=True)
+        os.makedirs(self.__directory)
+        self.__manifest = None
+
+        group_keys = [data[self.__partition_column]]
+        if self.__partition_by_decade:
+            group_keys.append((data.index.year // 10) * 10)
+
+        partitions = list()
+        catalog_by_key = dict()
+
+        # Partitions are stored ordered by key and decade, so that loaded ones follow 'Time' order...
+        for k, (group_key, partition) in enumerate(data.groupby(group_keys, sort=True, observed=True)):
+
+            key = group_key[0]
+            decade = int(group_key[1]) if self.__partition_by_decade else None
+
+            # Unused categories are dropped, otherwise every partition would store all of them...
+            partition = partition.copy()
+            for column in partition.columns:
+                if isinstance(partition[column].dtype, pandas.CategoricalDtype):
+                    partition[column] = partition[column].cat.remove_unused_categories()
+
+            directory = "partition_{}".format(k)
+            TimeSeriesDatasetCache(self.__file, os.path.join(self.__directory, directory)).store(partition)
+
+            partitions.append({"key": key, "decade": decade, "directory": directory, "rows": len(partition)})
+
+        # Catalog values follow the order of data, not the one of partitions...
+        if self.__catalog_column is not None:
+            for key, values in data[self.__catalog_column].groupby(data[self.__partition_column], sort=False,
+                                                                   observed=True):
+                catalog_by_key[key] = values.dropna().unique().tolist()
+
+        manifest = {"format_version": TimeSeriesDatasetPartitionedStore.format_version,
+                    "fingerprint": fingerprint,
+                    "partition_column": self.__partition_column,
+                    "catalog_column": self.__catalog_column,
+                    "partition_by_decade": self.__partition_by_decade,
+                    "time_range": [data.index.min().isoformat(), data.index.max().isoformat()],
+                    "columns": data.columns.tolist(),
+                    "numeric_type_columns": data.select_dtypes(include=[numpy.number]).columns.tolist(),
+                    "keys": data[self.__partition_column].dropna().unique().tolist(),
+                    "catalog": None,
+                    "catalog_by_key": None,
+                    "statistics": None,
+                    "partitions": partitions}
+
+        if self.__catalog_column is not None:
+            manifest["catalog"] = data[self.__catalog_column].dropna().unique().tolist()
+            manifest["catalog_by_key"] = catalog_by_key
+
+        manifest["statistics"] = self.__compute_statistics(data)
+
+        temporary_path = os.path.join(self.__directory, TimeSeriesDatasetPartitionedStore.manifest_file_name + ".tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temporary_path, os.path.join(self.__directory, TimeSeriesDatasetPartitionedStore.manifest_file_name))
+
+    def __compute_statistics(self, data):
+        """
+        This function is used to compute the number of rows and the time range of every key and, if any, of every
+        catalog value inside each key.
+        """
+        time = pandas.Series(data.index.values, index=data.index)
+
+        output = dict()
+        for key, x in time.groupby(data[self.__partition_column], sort=False, observed=True).agg(
+                ["size", "min", "max"]).iterrows():
+            output[key] = {"row_count": int(x["size"]),
+                           "time_range": [x["min"].isoformat(), x["max"].isoformat()],
+                           "catalog": None}
+
+        if self.__catalog_column is not None:
+            for (key, value), x in time.groupby([data[self.__partition_column], data[self.__catalog_column]],
+                                                sort=False, observed=True).agg(["size", "min", "max"]).iterrows():
+                catalog = output[key]["catalog"] = output[key]["catalog"] or dict()
+                catalog[value] = {"row_count": int(x["size"]),
+                                  "time_range": [x["min"].isoformat(), x["max"].isoformat()]}
+
+        return output
+
+    def load(self, keys=None, decades=None, memory_map=False):
+        """
+        This function is used to load the partitions matching specified keys and decades ('None' means all of them).
+        It returns a 'pandas.DataFrame' object sorted by partition column, catalog column (if any) and 'Time', like
+        the data the store was built from.
+        """
+        manifest = self.__get_manifest()
+
+        frames = list()
+        for partition in manifest["partitions"]:
+
+            if keys is not None and partition["key"] not in keys:
+                continue
+            if decades is not None and partition["decade"] not in decades:
+                continue
+
+            cache = TimeSeriesDatasetCache(self.__file, os.path.join(self.__directory, partition["directory"]))
+            frames.append(cache.load(memory_map))
+
+        if any(x is None for x in frames):
+            raise RuntimeError("[ERROR]: Partitioned store of '{}' is corrupted!".format(self.__file))
+
+        if len(frames) == 0:
+            return pandas.DataFrame(columns=manifest["columns"], index=pandas.DatetimeIndex([], name="Time"))
+        if len(frames) == 1:
+            return frames[0]
+
+        output = pandas.concat(frames)
+
+        # Restore 'category' type lost by concatenation of partitions having different categories...
+        for column in frames[0].columns:
+            if isinstance(frames[0][column].dtype, pandas.CategoricalDtype):
+                output[column] = output[column].astype("category")
+
+        # Records of a catalog value (i.e. a 'City') are split among decades: they are put together again...
+        if self.__partition_by_decade:
+            output = TimeSeriesDatasetPartitionedStore.__sort(output, [self.__partition_column, self.__catalog_column])
+
+        return output
+
+    @staticmethod
+    def __sort(data, columns):
+        """
+        This function is used to sort specified data by specified columns (if present) and 'Time'. Sort is stable and
+        data already sorted are returned as they are.
+        """
+        keys = [data.index.values]
+        for column in reversed(columns):
+            if column in data.columns:
+                values = data[column]
+                keys.append(values.cat.codes.to_numpy() if isinstance(values.dtype, pandas.CategoricalDtype)
+                            else values.to_numpy())
+
+        order = numpy.lexsort(keys)
+        if numpy.all(order[1:] > order[:-1]):
+            return data
+
+        return data.take(order)
+
+    def get_size(self):
+        """
+        This function is used to get the number of rows stored inside all partitions.
+        """
+        return sum(x["rows"] for x in self.__get_manifest()["partitions"])
+
+    def get_keys(self):
+        return self.__get_manifest()["keys"]
+
+    def get_decades(self, key):
+        """
+        This function is used to get the sorted list of decades available for specified key.
+        """
+        if not self.__partition_by_decade:
+            return None
+
+        return sorted(x["decade"] for x in self.__get_manifest()["partitions"] if x["key"] == key)
+
+    def get_catalog(self, key=None):
+        """
+        This function is used to get the values of 'catalog column', inside the whole dataset or inside the
+        partitions of specified key.
+        """
+        manifest = self.__get_manifest()
+
+        if key is None:
+            return manifest["catalog"]
+        if manifest["catalog_by_key"] is None:
+            return None
+
+        return manifest["catalog_by_key"].get(key)
+
+    def get_statistics(self, key, value=None):
+        """
+        This function is used to get the number of rows and the time range of specified key or, if specified, of a
+        catalog value inside it. It returns 'None' if they do not exist.
+        """
+        output = self.__get_manifest()["statistics"].get(key)
+
+        if output is not None and value is not None:
+            output = None if output["catalog"] is None else output["catalog"].get(value)
+
+        if output is None:
+            return None
+
+        return {"row_count": output["row_count"], "time_range": [pandas.Timestamp(x) for x in output["time_range"]]}
+
+    def get_time_range(self):
+        return [pandas.Timestamp(x) for x in self.__get_manifest()["time_range"]]
+
+    def get_columns(self):
+        return self.__get_manifest()["columns"]
+
+    def get_numeric_type_columns(self):
+        return self.__get_manifest()["numeric_type_columns"]
+
+    def is_partitioned_by_decade(self):
+        return self.__partition_by_decade
+
+    def __get_manifest(self):
+        if self.__manifest is None:
+            self.__manifest = self.__read_manifest()
+            if self.__manifest is None:
+                raise RuntimeError("[ERROR]: Partitioned store of '{}' does NOT exist!".format(self.__file))
+
+        return self.__manifest
+
+    def __read_manifest(self):
+        try:
+            with open(os.path.join(self.__directory, TimeSeriesDatasetPartitionedStore.manifest_file_name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,313 @@
+from src.TimeSeriesDataset.TimeSeriesDatasetGlobalClimateChange import TimeSeriesDatasetGlobalClimateChange
+
+
+class TimeSeriesDatasetQuery(object):
+    """
+    This class represents a 'declarative' query over a 'Global Climate Change' dataset, that is a description of
+    which places, months, years and columns have to be selected and of how missing records have to be managed
+    ('gap_policy'): they can be inserted and interpolated ('interpolate') or left missing ('none').
+
+    Every place is a 'State' name or, for datasets having 'City' field, a ('State', 'City') pair; datasets without
+    'State' field are queried without places. Unspecified months, years and columns mean all of them.
+
+    Queries are validated once, when built; they are immutable and hashable, so they can be used as cache keys.
+    Every 'with_*' function returns a new query. When a query is executed, its stages are run in the order chosen by
+    'get_plan', according to the estimated number of rows touched by each stage; use 'explain' to show them.
+    """
+
+    gap_policies = ["interpolate", "none"]
+
+    def __init__(self, dataset, places=None, months=None, year_range=None, columns=None, gap_policy="interpolate"):
+
+        if not isinstance(dataset, TimeSeriesDatasetGlobalClimateChange):
+            raise TypeError("[ERROR]: 'dataset' must be 'TimeSeriesDatasetGlobalClimateChange' type object! ({})"
+                            .format(type(dataset)))
+        if places is not None and not isinstance(places, (list, tuple)):
+            raise TypeError("[ERROR]: 'places' must 'list' type object! ({})".format(type(places)))
+        if months is not None and not isinstance(months, (list, tuple)):
+            raise TypeError("[ERROR]: 'months' must 'list' type object! ({})".format(type(months)))
+        if year_range is not None and not isinstance(year_range, (list, tuple)):
+            raise TypeError("[ERROR]: 'year_range' must 'list' type object! ({})".format(type(year_range)))
+        if columns is not None and not isinstance(columns, (list, tuple)):
+            raise TypeError("[ERROR]: 'columns' must 'list' type object! ({})".format(type(columns)))
+
+        self.__dataset = dataset
+        self.__places = tuple() if places is None else tuple(places)
+        self.__months = None if months is None else tuple(months)
+        self.__year_range = tuple(dataset.get_time_range_as_years() if year_range is None else year_range)
+        self.__columns = tuple(dataset.get_numeric_type_columns() if columns is None else columns)
+        self.__gap_policy = gap_policy
+
+        self.__validate()
+
+        # Months are kept in calendar order, so that equivalent queries have the same key...
+        if self.__months is not None:
+            self.__months = tuple(sorted(set(self.__months),
+                                         key=lambda x: TimeSeriesDatasetGlobalClimateChange.month_calendar_map[x]))
+
+    def __validate(self):
+        """
+        This function is used to check the query against its dataset.
+        """
+        has_state = self.__dataset.get_state_list() is not None
+        has_city = self.__dataset.get_city_list() is not None
+
+        # MONTHS...
+        # ========================================= #
+        if self.__months is not None:
+            if len(self.__months) == 0 or "" in self.__months:
+                raise ValueError("[ERROR]: MONTH empty!")
+
+            for month in self.__months:
+                if month not in TimeSeriesDatasetGlobalClimateChange.month_calendar_map.keys():
+                    raise ValueError("[ERROR]: Specified MONTH name does NOT exist!")
+
+        # PLACES...
+        # ========================================= #
+        if has_state and len(self.__places) == 0:
+            raise ValueError("[ERROR]: 'STATE' field empty!")
+        if not has_state and len(self.__places) != 0:
+            raise ValueError("[ERROR]: Dataset '{}' has no 'STATE' field!".format(self.__dataset.get_name()))
+
+        for place in self.__places:
+            state, city = TimeSeriesDatasetQuery.__split_place(place)
+
+            if state == "":
+                raise ValueError("[ERROR]: 'STATE' field empty!")
+            if self.__dataset.get_place_summary(state) is None:
+                raise ValueError("[ERROR]: Specified 'STATE' does NOT exist!")
+            if has_city and city == "":
+                raise ValueError("[ERROR]: 'CITY' field empty!")
+            if self.__dataset.get_place_summary(state, city) is None:
+                raise ValueError("[ERROR]: Specified 'CITY' does NOT exist!")
+
+        if len(set(self.__places)) != len(self.__places):
+            raise ValueError("[ERROR]: Places must be unique!")
+
+        # COLUMNS...
+        # ========================================= #
+        if len(self.__columns) == 0:
+            raise ValueError("[ERROR]: No 'COLUMN' selected!")
+
+        for column in self.__columns:
+            if column not in self.__dataset.get_numeric_type_columns():
+                raise ValueError("[ERROR]: Column '{}' does NOT exist!".format(column))
+
+        # YEAR RANGE...
+        # ========================================= #
+        if len(self.__year_range) != 2 or not all(isinstance(x, int) for x in self.__year_range) \
+                or self.__year_range[0] > self.__year_range[1]:
+            raise ValueError("[ERROR]: Specified 'TIME RANGE' is INVALID!")
+
+        # GAP POLICY...
+        # ========================================= #
+        if self.__gap_policy not in TimeSeriesDatasetQuery.gap_policies:
+            raise ValueError("[ERROR]: 'gap_policy' must be one of {}!".format(TimeSeriesDatasetQuery.gap_policies))
+
+    @staticmethod
+    def __split_place(place):
+        """
+        This function is used to convert a place into a ('State', 'City') pair.
+        """
+        if isinstance(place, str):
+            return place, ""
+        if isinstance(place, tuple) and len(place) == 2 and all(isinstance(x, str) for x in place):
+            return place
+
+        raise TypeError("[ERROR]: Every place must be a 'str' or a ('State', 'City') pair! ({})".format(place))
+
+    def with_places(self, places):
+        return self.__replace(places=places)
+
+    def with_months(self, months):
+        return self.__replace(months=months)
+
+    def with_year_range(self, year_range):
+        return self.__replace(year_range=year_range)
+
+    def with_columns(self, columns):
+        return self.__replace(columns=columns)
+
+    def with_gap_policy(self, gap_policy):
+        return self.__replace(gap_policy=gap_policy)
+
+    def __replace(self, **changes):
+        arguments = {"places": self.__places,
+                     "months": self.__months,
+                     "year_range": self.__year_range,
+                     "columns": self.__columns,
+                     "gap_policy": self.__gap_policy}
+        arguments.update(changes)
+
+        return TimeSeriesDatasetQuery(self.__dataset, **arguments)
+
+    def execute(self):
+        """
+        This function is used to execute current query (see 'TimeSeriesDatasetGlobalClimateChange.execute_query').
+        """
+        return self.__dataset.execute_query(self)
+
+    def get_plan(self):
+        """
+        This function is used to choose the order of the stages of current query.
+
+        'Month' filter and 'year range' selection can be run in any order, giving the same results: the order
+        touching fewer rows, according to the place summaries of the dataset, is chosen. It returns a list of 'dict'
+        objects, one for each stage, holding its name and the estimated number of rows it touches and returns.
+        """
+        orders = [["year_range_selection"]]
+        if self.__months is not None:
+            orders = [["month_filter", "year_range_selection"], ["year_range_selection", "month_filter"]]
+
+        output = None
+        for order in orders:
+            stages = ["place_selection"] + order
+            if self.__gap_policy == "interpolate":
+                stages += ["gap_filling", "year_range_filter"]
+
+            plan = self.__estimate(stages)
+            if output is None or sum(x["rows_touched"] for x in plan) < sum(x["rows_touched"] for x in output):
+                output = plan
+
+        return output
+
+    def __estimate(self, stages):
+        """
+        This function is used to estimate the number of rows touched and returned by each one of specified stages,
+        summed over all places.
+        """
+        output = [{"stage": x, "rows_touched": 0, "rows": 0} for x in stages]
+
+        month_selectivity = 1 if self.__months is None else len(self.__months) / 12
+        first_month = self.__year_range[0] * 12
+        last_month = self.__year_range[1] * 12 + 11
+
+        for place in self.__places or [None]:
+
+            if place is None:
+                row_count = self.__dataset.get_row_count()
+                time_range = self.__dataset.get_time_range()
+            else:
+                summary = self.__dataset.get_place_summary(*TimeSeriesDatasetQuery.__split_place(place))
+                row_count = summary["row_count"]
+                time_range = summary["time_range"]
+
+            place_first_month = time_range[0].year * 12 + time_range[0].month - 1
+            place_last_month = time_range[1].year * 12 + time_range[1].month - 1
+
+            # Number of months of the place and of the part of it inside the year range...
+            span = place_last_month - place_first_month + 1
+            window = max(min(last_month, place_last_month) - max(first_month, place_first_month) + 1, 0)
+            rows_per_month = row_count / span
+
+            rows = 0
+            is_month_filter_applied = False
+            is_gap_filled = False
+
+            for stage in output:
+
+                if stage["stage"] == "place_selection":
+                    # Only partitions are read, in-memory data are sliced...
+                    touched = row_count if self.__dataset.is_partitioned() else 0
+                    rows = row_count
+
+                elif stage["stage"] == "month_filter":
+                    touched = rows
+                    rows = rows * month_selectivity
+                    is_month_filter_applied = True
+
+                elif stage["stage"] == "year_range_selection":
+                    # The nearest rows around the year range are needed by interpolation...
+                    boundary = 0
+                    if self.__gap_policy == "interpolate":
+                        boundary = 2 * rows_per_month / (1 if is_month_filter_applied else month_selectivity)
+
+                    if is_month_filter_applied:
+                        touched = rows
+                        rows = window * rows_per_month * month_selectivity + boundary
+                    else:
+                        touched = window * rows_per_month + boundary
+                        rows = touched
+
+                elif stage["stage"] == "gap_filling":
+                    touched = rows
+                    rows = window + 2 if window != 0 else 0
+
+                else:
+                    touched = rows
+                    rows = window
+
+                # Until gaps are filled, no stage touches more rows than the place has; filters never return more
+                # rows than they are given...
+                if not is_gap_filled:
+                    touched = min(touched, row_count)
+                if stage["stage"] in ["month_filter", "year_range_selection", "year_range_filter"]:
+                    rows = min(rows, touched)
+                if stage["stage"] == "gap_filling":
+                    is_gap_filled = True
+
+                stage["rows_touched"] += int(round(touched))
+                stage["rows"] += int(round(rows))
+
+        return output
+
+    def explain(self):
+        """
+        This function is used to get a description of the plan of current query, showing the estimated number of
+        rows touched and returned by each stage.
+        """
+        plan = self.get_plan()
+
+        output = "Query Plan ('{}'):\n".format(self.__dataset.get_name())
+        for k, stage in enumerate(plan):
+            output += "{}. {:<22} rows touched: {:>10}   rows: {:>10}\n".format(k + 1, stage["stage"],
+                                                                             stage["rows_touched"], stage["rows"])
+        output += "-> Total rows touched: {}".format(sum(x["rows_touched"] for x in plan))
+
+        return output
+
+    def get_dataset(self):
+        return self.__dataset
+
+    def get_places(self):
+        return self.__places
+
+    def get_place_filter(self, place):
+        """
+        This function is used to get the ('State', 'City') pair of specified place of current query.
+        """
+        return TimeSeriesDatasetQuery.__split_place(place)
+
+    def get_months(self):
+        return self.__months
+
+    def get_month_indexes(self):
+        if self.__months is None:
+            return None
+
+        return [TimeSeriesDatasetGlobalClimateChange.month_calendar_map[x] for x in self.__months]
+
+    def get_year_range(self):
+        return list(self.__year_range)
+
+    def get_columns(self):
+        return list(self.__columns)
+
+    def get_gap_policy(self):
+        return self.__gap_policy
+
+    def __get_key(self):
+        return self.__places, self.__months, self.__year_range, self.__columns, self.__gap_policy
+
+    def __hash__(self):
+        return hash((self.__dataset.get_name(),) + self.__get_key())
+
+    def __eq__(self, other):
+        return isinstance(other, TimeSeriesDatasetQuery) \
+            and self.__dataset is other.get_dataset() \
+            and self.__get_key() == other.__get_key()
+
+    def __repr__(self):
+        return "TimeSeriesDatasetQuery('{}', places={}, months={}, year_range={}, columns={}, gap_policy='{}')".format(
+            self.__dataset.get_name(), list(self.__places), self.__months, list(self.__year_range),
+            list(self.__columns), self.__gap_policy)
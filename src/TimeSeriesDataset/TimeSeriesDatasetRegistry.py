@@ -0,0 +1,173 @@
+import collections
+import concurrent.futures
+
+from src.TimeSeriesDataset.TimeSeriesDataset import TimeSeriesDataset
+from src.TimeSeriesDataset.TimeSeriesDatasetCache import TimeSeriesDatasetCache
+
+
+class TimeSeriesDatasetDescriptor(object):
+    """
+    This class represents a lightweight description of a 'Time Series' dataset, that is all information needed to
+    load it without actually loading it.
+    """
+
+    def __init__(self, name, file, dataset_class, use_cache=True, use_memory_map=False, partitioning=None):
+
+        if not isinstance(name, str):
+            raise TypeError("[ERROR]: 'name' must be 'str' type.")
+        if not isinstance(file, str):
+            raise TypeError("[ERROR]: 'file' must be 'str' type.")
+        if not issubclass(dataset_class, TimeSeriesDataset):
+            raise TypeError("[ERROR]: 'dataset_class' must be a 'TimeSeriesDataset' subclass.")
+
+        self.__name = name
+        self.__file = file
+        self.__dataset_class = dataset_class
+        self.__use_cache = use_cache
+        self.__use_memory_map = use_memory_map
+        self.__partitioning = partitioning
+
+    def load(self):
+        """
+        This function is used to build the 'TimeSeriesDataset' object described by current descriptor.
+        """
+        return self.__dataset_class(self.__name, self.__file, self.__use_cache, self.__use_memory_map,
+                                    self.__partitioning)
+
+    def build_cache(self):
+        """
+        This function is used to parse described file and store it into the 'columnar' cache, without building any
+        'TimeSeriesDataset' object. Nothing is done if the cache is already valid.
+
+        It is meant to be run inside a worker process: only dataset's name is sent back to the caller.
+        """
+        cache = TimeSeriesDatasetCache(self.__file)
+        if not cache.is_valid():
+            cache.store(self.__dataset_class.read_file(self.__file))
+
+        return self.__name
+
+    def is_cache_enabled(self):
+        return self.__use_cache
+
+    def get_name(self):
+        return self.__name
+
+    def get_file(self):
+        return self.__file
+
+    def get_dataset_class(self):
+        return self.__dataset_class
+
+
+class TimeSeriesDatasetRegistry(object):
+    """
+    Exploiting 'Registry Design Pattern', this class is used to manage all available 'Time Series' datasets.
+
+    Datasets are loaded 'lazily', that is only when they are requested for the first time. When the memory used by
+    loaded datasets exceeds the specified budget (in bytes), least-recently-used datasets are evicted; the
+    most recently requested dataset is never evicted.
+    """
+
+    def __init__(self, memory_budget=None):
+
+        if memory_budget is not None and (not isinstance(memory_budget, int) or memory_budget <= 0):
+            raise ValueError("[ERROR]: 'memory_budget' must be a positive 'int' or 'None'!")
+
+        self.__memory_budget = memory_budget
+        self.__descriptors = dict()
+        self.__loaded_datasets = collections.OrderedDict()
+
+    def register(self, descriptor):
+        """
+        This function is used to register a dataset, specified by its descriptor, without loading it.
+        """
+        if not isinstance(descriptor, TimeSeriesDatasetDescriptor):
+            raise TypeError("[ERROR]: 'descriptor' must be 'TimeSeriesDatasetDescriptor' type.")
+
+        self.__descriptors[descriptor.get_name()] = descriptor
+
+    def get(self, dataset_name):
+        """
+        This function is used to get a dataset, loading it if needed.
+        """
+        descriptor = self.__descriptors.get(dataset_name)
+        if descriptor is None:
+            raise ValueError("[ERROR]: Dataset '{}' does NOT exist!".format(dataset_name))
+
+        output = self.__loaded_datasets.get(dataset_name)
+
+        if output is None:
+            output = descriptor.load()
+            self.__loaded_datasets[dataset_name] = output
+        else:
+            self.__loaded_datasets.move_to_end(dataset_name)
+
+        self.__evict()
+
+        return output
+
+    def load_all(self, processes=None, callback=None):
+        """
+        This function is used to load all registered datasets.
+
+        When cache is enabled, files are parsed concurrently by a pool of 'processes' worker processes; each worker
+        stores parsed data into the 'columnar' cache, from which datasets are then cheaply built by current process.
+        Otherwise, files are parsed one after another.
+
+        If specified, 'callback(dataset_name, completed, total)' is invoked as soon as each dataset is loaded.
+        """
+        if processes is not None and (not isinstance(processes, int) or processes <= 0):
+            raise ValueError("[ERROR]: 'processes' must be a positive 'int' or 'None'!")
+
+        descriptors = list(self.__descriptors.values())
+        cached_descriptors = [x for x in descriptors if x.is_cache_enabled()]
+        completed = 0
+
+        if len(cached_descriptors) != 0:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [executor.submit(x.build_cache) for x in cached_descriptors]
+
+                for future in concurrent.futures.as_completed(futures):
+                    dataset_name = future.result()
+                    self.get(dataset_name)
+
+                    completed += 1
+                    if callback is not None:
+                        callback(dataset_name, completed, len(descriptors))
+
+        for descriptor in descriptors:
+            if not descriptor.is_cache_enabled():
+                self.get(descriptor.get_name())
+
+                completed += 1
+                if callback is not None:
+                    callback(descriptor.get_name(), completed, len(descriptors))
+
+    def is_loaded(self, dataset_name):
+        return dataset_name in self.__loaded_datasets
+
+    def get_dataset_names(self):
+        return list(self.__descriptors.keys())
+
+    def get_descriptor(self, dataset_name):
+        return self.__descriptors.get(dataset_name)
+
+    def get_memory_budget(self):
+        return self.__memory_budget
+
+    def get_memory_usage(self):
+        """
+        This function is used to get the number of bytes used by all loaded datasets.
+        """
+        return sum(dataset.get_memory_usage() for dataset in self.__loaded_datasets.values())
+
+    def __evict(self):
+        """
+        This function is used to evict least-recently-used datasets until memory budget is respected.
+        """
+        if self.__memory_budget is None:
+            return
+
+        while len(self.__loaded_datasets) > 1 and self.get_memory_usage() > self.__memory_budget:
+            self.__loaded_datasets.popitem(last=False)
@@ -0,0 +1,96 @@
+import collections
+
+from src import Common
+
+pandas = Common.lazy_import("pandas")
+
+
+class TimeSeriesDatasetResultCache(object):
+    """
+    This class is used to keep the results of recent queries (i.e. filtered data) of a 'Time Series' dataset.
+
+    Results are 'pandas.DataFrame' objects whose columns are read-only views: arrays of stored results are never
+    copied, so results which are slices of whole dataset data share memory with it. Every lookup returns a new shallow
+    copy of them. When stored results exceed the 'memory_budget' (in bytes), least-recently-used ones are evicted;
+    memory shared with whole dataset data is counted too, so the budget is a conservative bound.
+    """
+
+    def __init__(self, memory_budget):
+
+        if not isinstance(memory_budget, int) or memory_budget < 0:
+            raise ValueError("[ERROR]: 'memory_budget' must be a non-negative 'int'!")
+
+        self.__memory_budget = memory_budget
+        self.__memory_usage = 0
+        self.__results = collections.OrderedDict()
+
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key):
+        """
+        This function is used to get the result stored using specified key. It returns 'None' if it is missing.
+        """
+        entry = self.__results.get(key)
+
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__results.move_to_end(key)
+
+        return entry[0].copy(deep=False)
+
+    def put(self, key, data):
+        """
+        This function is used to store a read-only view of specified result. It returns it.
+        Results larger than the whole memory budget are not stored.
+        """
+        if not isinstance(data, pandas.DataFrame):
+            raise TypeError("[ERROR]: 'data' must be 'pandas.DataFrame' type.")
+
+        columns = dict()
+        for column in data.columns:
+            # A new view is made read-only, leaving the flags of viewed arrays untouched...
+            values = data[column].to_numpy().view()
+            values.flags.writeable = False
+            columns[column] = values
+
+        output = pandas.DataFrame(columns, index=data.index, columns=data.columns, copy=False)
+        output.attrs = dict(data.attrs)
+        size = int(output.memory_usage(index=True, deep=True).sum())
+
+        if size <= self.__memory_budget:
+            self.__remove(key)
+            self.__results[key] = (output, size)
+            self.__memory_usage += size
+            self.__evict()
+
+        return output.copy(deep=False)
+
+    def clear(self):
+        self.__results.clear()
+        self.__memory_usage = 0
+
+    def get_statistics(self):
+        """
+        This function is used to get the number of hits, misses and stored results, together with used memory.
+        """
+        return {"hits": self.__hits,
+                "misses": self.__misses,
+                "entries": len(self.__results),
+                "memory_usage": self.__memory_usage,
+                "memory_budget": self.__memory_budget}
+
+    def __remove(self, key):
+        entry = self.__results.pop(key, None)
+        if entry is not None:
+            self.__memory_usage -= entry[1]
+
+    def __evict(self):
+        """
+        This function is used to evict least-recently-used results until memory budget is respected.
+        """
+        while self.__memory_usage > self.__memory_budget:
+            self.__memory_usage -= self.__results.popitem(last=False)[1][1]
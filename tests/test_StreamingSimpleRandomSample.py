@@ -0,0 +1,100 @@
+import unittest
+
+import numpy
+
+from src.Statistics.SimpleRandomSample import SimpleRandomSample
+from src.Statistics.StreamingSimpleRandomSample import StreamingSimpleRandomSample
+
+
+class TestStreamingSimpleRandomSample(unittest.TestCase):
+
+    def setUp(self):
+        generator = numpy.random.default_rng(7)
+
+        # Monthly timestamps, in seconds, and temperatures: X values are large, like the ones of regression lines...
+        self.observations_x = 1.5e9 + 2.6e6 * numpy.arange(1000, dtype=numpy.float64)
+        self.observations_y = 15 + 1e-9 * self.observations_x + generator.normal(0, 3, 1000)
+
+    def __assert_same_statistics(self, sample, other):
+        self.assertEqual(sample.get_size(), other.get_size())
+        self.assertAlmostEqual(sample.get_mean(), other.get_mean(), delta=1e-12 * abs(other.get_mean()))
+        self.assertAlmostEqual(sample.get_paired_mean(), other.get_paired_mean(), delta=1e-12)
+
+        for name in ["get_sum_of_squares", "get_paired_sum_of_squares", "get_co_moment", "get_unbiased_variance",
+                     "get_paired_unbiased_variance", "get_sample_covariance"]:
+            expected = getattr(other, name)()
+            self.assertAlmostEqual(getattr(sample, name)(), expected, delta=1e-9 * abs(expected), msg=name)
+
+    def test_merged_chunks_give_whole_sample_statistics(self):
+        whole = StreamingSimpleRandomSample(paired=True).update(self.observations_x, self.observations_y)
+
+        merged = StreamingSimpleRandomSample(paired=True)
+        for start, stop in [(0, 1), (1, 250), (250, 251), (251, 777), (777, 1000)]:
+            chunk = StreamingSimpleRandomSample(paired=True)
+            chunk.update(self.observations_x[start:stop], self.observations_y[start:stop])
+            merged.merge(chunk)
+
+        self.__assert_same_statistics(merged, whole)
+
+    def test_observations_added_one_by_one_give_whole_sample_statistics(self):
+        whole = StreamingSimpleRandomSample(paired=True).update(self.observations_x, self.observations_y)
+
+        sample = StreamingSimpleRandomSample(paired=True)
+        for x, y in zip(self.observations_x, self.observations_y):
+            sample.update(x, y)
+
+        self.__assert_same_statistics(sample, whole)
+
+    def test_statistics_match_simple_random_sample(self):
+        sample = StreamingSimpleRandomSample(paired=True).update(self.observations_x, self.observations_y)
+
+        sample_x = SimpleRandomSample(self.observations_x)
+        sample_y = SimpleRandomSample(self.observations_y)
+        covariance = SimpleRandomSample.calc_sample_covariance(sample_x, sample_y)
+
+        self.assertAlmostEqual(sample.get_mean(), sample_x.get_mean(), delta=1e-12 * sample_x.get_mean())
+        self.assertAlmostEqual(sample.get_paired_mean(), sample_y.get_mean(), delta=1e-12)
+        self.assertAlmostEqual(sample.get_unbiased_variance(), sample_x.get_unbiased_variance(),
+                               delta=1e-9 * sample_x.get_unbiased_variance())
+        self.assertAlmostEqual(sample.get_paired_unbiased_variance(), sample_y.get_unbiased_variance(),
+                               delta=1e-9 * sample_y.get_unbiased_variance())
+        self.assertAlmostEqual(sample.get_sample_covariance(), covariance, delta=1e-9 * abs(covariance))
+
+    def test_merging_empty_sample_changes_nothing(self):
+        sample = StreamingSimpleRandomSample().update(self.observations_y)
+        mean = sample.get_mean()
+        sum_of_squares = sample.get_sum_of_squares()
+
+        sample.merge(StreamingSimpleRandomSample())
+        self.assertEqual(sample.get_size(), 1000)
+        self.assertEqual(sample.get_mean(), mean)
+        self.assertEqual(sample.get_sum_of_squares(), sum_of_squares)
+
+        empty = StreamingSimpleRandomSample().merge(sample)
+        self.assertEqual(empty.get_size(), 1000)
+        self.assertEqual(empty.get_mean(), mean)
+        self.assertEqual(empty.get_sum_of_squares(), sum_of_squares)
+
+    def test_empty_sample_statistics_are_nan(self):
+        sample = StreamingSimpleRandomSample(paired=True)
+
+        self.assertEqual(sample.get_size(), 0)
+        self.assertTrue(numpy.isnan(sample.get_mean()))
+        self.assertTrue(numpy.isnan(sample.get_unbiased_variance()))
+        self.assertTrue(numpy.isnan(sample.get_sample_covariance()))
+
+    def test_invalid_usage_raises(self):
+        with self.assertRaises(ValueError):
+            StreamingSimpleRandomSample(paired=True).update([1.0, 2.0])
+        with self.assertRaises(ValueError):
+            StreamingSimpleRandomSample().update([1.0, 2.0], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            StreamingSimpleRandomSample(paired=True).update([1.0, 2.0], [1.0])
+        with self.assertRaises(ValueError):
+            StreamingSimpleRandomSample(paired=True).merge(StreamingSimpleRandomSample())
+        with self.assertRaises(ValueError):
+            StreamingSimpleRandomSample().get_co_moment()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import numpy
+import pandas
+
+from src.TimeSeriesDataset.TimeSeriesDatasetGlobalClimateChange import TimeSeriesDatasetGlobalClimateChange
+
+
+def write_city_dataset(file, seed):
+    """
+    This function is used to write a small synthetic 'City' dataset file. Cities of the same country start in
+    different decades and their records have gaps, missing values and leading and trailing runs of missing values;
+    rows are shuffled.
+    """
+    generator = numpy.random.default_rng(seed)
+
+    rows = list()
+    for country in range(4):
+        for city in range(3):
+            start = pandas.Timestamp(1840 + int(generator.integers(0, 60)), int(generator.integers(1, 13)), 1)
+            dates = pandas.date_range(start, periods=int(generator.integers(60, 600)), freq="MS")
+
+            is_kept = numpy.ones(len(dates), dtype=bool)
+            for _ in range(int(generator.integers(0, 4))):
+                first = int(generator.integers(0, len(dates)))
+                is_kept[first:first + int(generator.integers(1, 40))] = False
+            dates = dates[is_kept]
+
+            is_missing = generator.random(len(dates)) < 0.15
+            is_missing[:int(generator.integers(0, 12))] = True
+            is_missing[len(dates) - int(generator.integers(0, 12)):] = True
+
+            temperatures = generator.normal(10, 5, len(dates)).round(3)
+            uncertainties = generator.random(len(dates)).round(3)
+
+            for k, date in enumerate(dates):
+                rows.append((date.strftime("%Y-%m-%d"),
+                             "" if is_missing[k] else temperatures[k],
+                             "" if is_missing[k] and k % 2 == 0 else uncertainties[k],
+                             "City {}-{}".format(country, city),
+                             "Country {}".format(country),
+                             "1.00N",
+                             "1.00E"))
+
+    data = pandas.DataFrame(rows, columns=["dt", "AverageTemperature", "AverageTemperatureUncertainty", "City",
+                                           "Country", "Latitude", "Longitude"])
+    data.sample(frac=1, random_state=seed).to_csv(file, index=False)
+
+
+class TestTimeSeriesDatasetGlobalClimateChange(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.file = os.path.join(cls.directory, "GlobalLandTemperaturesByCity.csv")
+        write_city_dataset(cls.file, 5)
+
+        cls.dataset = TimeSeriesDatasetGlobalClimateChange("City", cls.file, use_cache=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def __get_random_queries(self, count, seed):
+        """
+        This function is used to get random arguments of 'get_filtered_data', with time ranges also outside of the
+        time span of selected place.
+        """
+        generator = random.Random(seed)
+        months = list(TimeSeriesDatasetGlobalClimateChange.month_calendar_map.keys())
+
+        output = list()
+        for _ in range(count):
+            state = generator.choice(self.dataset.get_state_list())
+            city = generator.choice(self.dataset.get_city_list_belonging_to_state(state))
+            month = generator.choice(months + [""])
+
+            first_year = generator.randint(1830, 1960)
+            time_range = [first_year, generator.randint(first_year, first_year + generator.choice([2, 10, 60]))]
+            columns = generator.choice([["AverageTemperature"], ["AverageTemperature", "AverageTemperatureUncertainty"]])
+
+            output.append((month, month != "", city, state, time_range, columns))
+
+        return output
+
+    @staticmethod
+    def __get_filtered_data(dataset, arguments):
+        try:
+            return dataset.get_filtered_data(*arguments)
+        except ValueError as error:
+            return str(error)
+
+    def __assert_same_filtered_data(self, data, expected, message):
+        if isinstance(expected, str) or isinstance(data, str):
+            self.assertEqual(data, expected, message)
+            return
+
+        self.assertTrue(data.index.equals(expected.index), message)
+        self.assertEqual(data.columns.tolist(), expected.columns.tolist(), message)
+        numpy.testing.assert_allclose(data.to_numpy(dtype=numpy.float64), expected.to_numpy(dtype=numpy.float64),
+                                      err_msg=message)
+
+    def test_partitioned_data_match_in_memory_data(self):
+        for partitioning in ["state", "state_and_decade"]:
+            dataset = TimeSeriesDatasetGlobalClimateChange("City", self.file, use_cache=False,
+                                                           partitioning=partitioning)
+
+            self.assertEqual(dataset.get_state_list(), self.dataset.get_state_list())
+            for state in self.dataset.get_state_list():
+                self.assertEqual(dataset.get_city_list_belonging_to_state(state),
+                                 self.dataset.get_city_list_belonging_to_state(state))
+
+            for arguments in self.__get_random_queries(100, 1):
+                self.__assert_same_filtered_data(self.__get_filtered_data(dataset, arguments),
+                                                 self.__get_filtered_data(self.dataset, arguments),
+                                                 "{} {}".format(partitioning, arguments))
+
+            shutil.rmtree(os.path.join(self.directory, ".partitions"), ignore_errors=True)
+
+    def test_stage_orders_give_same_results(self):
+        from src.TimeSeriesDataset.TimeSeriesDatasetQuery import TimeSeriesDatasetQuery
+
+        run_query_stages = self.dataset._TimeSeriesDatasetGlobalClimateChange__run_query_stages
+        generator = random.Random(3)
+
+        for month, _, city, state, time_range, columns in self.__get_random_queries(60, 3):
+            months = [month] if month != "" else generator.sample(
+                list(TimeSeriesDatasetGlobalClimateChange.month_calendar_map.keys()), 3)
+            query = TimeSeriesDatasetQuery(self.dataset, [(state, city)], months, time_range, columns)
+
+            outputs = list()
+            for order in [["month_filter", "year_range_selection"], ["year_range_selection", "month_filter"]]:
+                try:
+                    outputs.append(run_query_stages(query, ["place_selection"] + order +
+                                                    ["gap_filling", "year_range_filter"]))
+                except ValueError as error:
+                    outputs.append(str(error))
+
+            self.__assert_same_filtered_data(outputs[1], outputs[0], "{} {} {}".format(months, (state, city),
+                                                                                     time_range))
+            if not isinstance(outputs[0], str):
+                self.assertEqual(outputs[1].attrs, outputs[0].attrs)
+
+    def test_grouped_regression_table_matches_regression_lines_of_filtered_data(self):
+        generator = random.Random(2)
+        months = list(TimeSeriesDatasetGlobalClimateChange.month_calendar_map.keys())
+
+        # Time ranges before, across, inside and after the time spans of places...
+        time_ranges = [[1830, 1845], [1835, 1870], [1860, 1875], [1880, 1880], [1890, 1950], [1840, 2000],
+                       [1950, 1960]]
+
+        for time_range in time_ranges:
+            for month in ["", generator.choice(months)]:
+                message = "{} {}".format(month, time_range)
+                table = self.dataset.get_grouped_regression_table("City", month, month != "", time_range,
+                                                                  "AverageTemperature")
+
+                expected = list()
+                for state in self.dataset.get_state_list():
+                    for city in self.dataset.get_city_list_belonging_to_state(state):
+                        data = self.__get_filtered_data(self.dataset, (month, month != "", city, state, time_range,
+                                                                       ["AverageTemperature"]))
+                        if isinstance(data, str) or len(data) < 2:
+                            continue
+
+                        line = TimeSeriesDatasetGlobalClimateChange.compute_univariate_regression_line(data)
+                        expected.append((state, city, len(data), line.get_slope(), line.get_intercept(),
+                                         line.get_coefficient_of_determination()))
+
+                expected = pandas.DataFrame(expected, columns=["State", "City", "Size", "Slope", "Intercept", "R^2"])
+                expected = expected.sort_values(["State", "City"], ignore_index=True)
+
+                self.assertEqual(table[["State", "City", "Size"]].values.tolist(),
+                                 expected[["State", "City", "Size"]].values.tolist(), message)
+                for column in ["Slope", "Intercept", "R^2"]:
+                    numpy.testing.assert_allclose(table[column].to_numpy(dtype=numpy.float64),
+                                                  expected[column].to_numpy(dtype=numpy.float64), rtol=1e-6,
+                                                  equal_nan=True, err_msg="{} {}".format(column, message))
+
+
+if __name__ == "__main__":
+    unittest.main()
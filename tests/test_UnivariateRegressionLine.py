@@ -0,0 +1,145 @@
+import importlib.util
+import math
+import unittest
+
+import numpy
+
+from src.Statistics.SimpleRandomSample import SimpleRandomSample
+from src.Statistics.StreamingSimpleRandomSample import StreamingSimpleRandomSample
+from src.Statistics.UnivariateRegressionLine import UnivariateRegressionLine
+
+
+def build_regression_line(observations_x, observations_y, name=""):
+    return UnivariateRegressionLine(name, SimpleRandomSample(list(observations_x)),
+                                    SimpleRandomSample(list(observations_y)))
+
+
+class TestUnivariateRegressionLine(unittest.TestCase):
+
+    def setUp(self):
+        generator = numpy.random.default_rng(11)
+
+        self.observations_x = 1.5e9 + 2.6e6 * numpy.arange(200, dtype=numpy.float64)
+        self.observations_y = 15 + 2e-8 * self.observations_x + generator.normal(0, 3, 200)
+
+    def test_fit_matches_least_squares(self):
+        line = build_regression_line(self.observations_x, self.observations_y)
+        slope, intercept = numpy.polyfit(self.observations_x - self.observations_x.mean(), self.observations_y, 1)
+        intercept -= slope * self.observations_x.mean()
+
+        self.assertAlmostEqual(line.get_slope(), slope, delta=1e-9 * abs(slope))
+        self.assertAlmostEqual(line.get_intercept(), intercept, delta=1e-9 * abs(intercept))
+
+    def test_sse_is_sum_of_squared_residuals(self):
+        line = build_regression_line(self.observations_x, self.observations_y)
+        residuals = self.observations_y - (line.get_intercept() + line.get_slope() * self.observations_x)
+
+        self.assertGreater(line.get_sse(), 0)
+        self.assertAlmostEqual(line.get_sse(), float(numpy.dot(residuals, residuals)), delta=1e-9 * line.get_sse())
+        self.assertAlmostEqual(line.get_sse(), float(numpy.dot(line.get_residuals_y(), line.get_residuals_y())),
+                               delta=1e-9 * line.get_sse())
+        self.assertAlmostEqual(line.get_tss(), line.get_ess() + line.get_sse(), delta=1e-9 * line.get_tss())
+        self.assertAlmostEqual(line.get_coefficient_of_determination(), 1 - line.get_sse() / line.get_tss(),
+                               delta=1e-12)
+
+    def test_p_values_with_1_degree_of_freedom(self):
+        # With 1 degree of freedom, T follows a Cauchy distribution: P(|T| >= |t|) = 1 - 2 / pi * atan(|t|)
+        line = build_regression_line([1.0, 2.0, 3.0], [1.0, 3.0, 2.5])
+
+        for t_statistic, p_value in [(line.get_slope_t_statistic(), line.get_slope_p_value()),
+                                     (line.get_intercept_t_statistic(), line.get_intercept_p_value())]:
+            self.assertAlmostEqual(p_value, 1 - 2 / math.pi * math.atan(abs(t_statistic)), delta=1e-12)
+
+    def test_p_values_with_2_degrees_of_freedom(self):
+        # With 2 degrees of freedom: P(|T| >= |t|) = 1 - |t| / sqrt(2 + t^2)
+        line = build_regression_line([1.0, 2.0, 3.0, 4.0], [1.0, 3.0, 2.5, 5.0])
+
+        for t_statistic, p_value in [(line.get_slope_t_statistic(), line.get_slope_p_value()),
+                                     (line.get_intercept_t_statistic(), line.get_intercept_p_value())]:
+            self.assertAlmostEqual(p_value, 1 - abs(t_statistic) / math.sqrt(2 + t_statistic ** 2), delta=1e-12)
+
+    def test_p_values_of_closed_forms_over_wide_t_range(self):
+        calc_two_sided_p_value = UnivariateRegressionLine._UnivariateRegressionLine__calc_two_sided_p_value
+
+        for t_statistic in [0.0, 1e-3, 0.5, -0.5, 1.0, 2.0, -3.7, 10.0, 250.0]:
+            self.assertAlmostEqual(calc_two_sided_p_value(t_statistic, 1),
+                                   1 - 2 / math.pi * math.atan(abs(t_statistic)), delta=1e-12)
+            self.assertAlmostEqual(calc_two_sided_p_value(t_statistic, 2),
+                                   1 - abs(t_statistic) / math.sqrt(2 + t_statistic ** 2), delta=1e-12)
+
+        self.assertEqual(calc_two_sided_p_value(math.inf, 5), 0.0)
+        self.assertTrue(math.isnan(calc_two_sided_p_value(1.0, 0)))
+
+    @unittest.skipUnless(importlib.util.find_spec("scipy"), "'scipy' is not installed")
+    def test_p_values_match_scipy(self):
+        from scipy import stats
+
+        calc_two_sided_p_value = UnivariateRegressionLine._UnivariateRegressionLine__calc_two_sided_p_value
+
+        for degrees_of_freedom in [3, 10, 198, 5000]:
+            for t_statistic in [0.1, 1.0, 2.5, -4.0, 12.0]:
+                expected = 2 * stats.t.sf(abs(t_statistic), degrees_of_freedom)
+                self.assertAlmostEqual(calc_two_sided_p_value(t_statistic, degrees_of_freedom), expected,
+                                       delta=1e-10 * expected)
+
+    def test_line_from_merged_statistics_matches_whole_fit(self):
+        line = build_regression_line(self.observations_x, self.observations_y)
+
+        statistics = StreamingSimpleRandomSample(paired=True)
+        for start in range(0, 200, 64):
+            chunk = StreamingSimpleRandomSample(paired=True)
+            chunk.update(self.observations_x[start:start + 64], self.observations_y[start:start + 64])
+            statistics.merge(chunk)
+
+        merged_line = UnivariateRegressionLine.from_statistics("", statistics)
+
+        for name in ["get_slope", "get_intercept", "get_coefficient_of_determination", "get_sse",
+                     "get_slope_standard_error", "get_slope_p_value"]:
+            expected = getattr(line, name)()
+            self.assertAlmostEqual(getattr(merged_line, name)(), expected, delta=1e-9 * abs(expected), msg=name)
+
+        self.assertEqual(merged_line.get_size(), 200)
+        with self.assertRaises(ValueError):
+            merged_line.get_fitted_values_y()
+
+    def test_constant_series_give_undefined_statistics(self):
+        # Y values all equal: the line is flat and R^2 is undefined...
+        line = build_regression_line(self.observations_x, [0.25] * 200)
+
+        self.assertEqual(line.get_slope(), 0.0)
+        self.assertEqual(line.get_intercept(), 0.25)
+        self.assertEqual(line.get_sse(), 0.0)
+        self.assertTrue(math.isnan(line.get_coefficient_of_determination()))
+
+        # X values all equal: the line is undefined...
+        line = build_regression_line([1.5e9] * 5, [1.0, 3.0, 2.5, 5.0, 4.0])
+
+        for value in [line.get_slope(), line.get_intercept(), line.get_sse(), line.get_coefficient_of_determination(),
+                      line.get_slope_standard_error(), line.get_slope_p_value()]:
+            self.assertTrue(math.isnan(value))
+
+    def test_rank_puts_undefined_coefficient_of_determination_last(self):
+        lines = [build_regression_line(self.observations_x, [0.25] * 200, "Constant"),
+                 build_regression_line(self.observations_x, self.observations_y, "Noisy")]
+
+        self.assertEqual([x["name"] for x in UnivariateRegressionLine.rank_regression_lines(lines)],
+                         ["Noisy", "Constant"])
+        self.assertEqual([x["name"] for x in UnivariateRegressionLine.rank_regression_lines(lines, top_k=1)],
+                         ["Noisy"])
+
+    def test_rank_labels_worst_line_only_when_complete(self):
+        generator = numpy.random.default_rng(3)
+        lines = [build_regression_line(self.observations_x, self.observations_y + generator.normal(0, scale, 200),
+                                       "Line {}".format(k)) for k, scale in enumerate([1, 8, 2, 30])]
+
+        rank = UnivariateRegressionLine.rank_regression_lines(lines)
+        self.assertEqual([x["name"] for x in rank], ["Line 0", "Line 2", "Line 1", "Line 3"])
+        self.assertEqual([x["is_worst"] for x in rank], [False, False, False, True])
+
+        top_rank = UnivariateRegressionLine.rank_regression_lines(lines, top_k=2)
+        self.assertEqual(top_rank, rank[:2])
+        self.assertFalse(any(x["is_worst"] for x in top_rank))
+
+
+if __name__ == "__main__":
+    unittest.main()